@@ -26,15 +26,19 @@ if str(ROOT) not in sys.path:
 
 import logging
 import os
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 
-import plotly.graph_objects as go
+# NOTE: plotly is imported lazily where charts are built (heavy import, only
+# needed once a chart is actually rendered).
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
 # Data layer (collection + cleaning)
@@ -43,14 +47,15 @@ from src.data import (
     Location,
     compute_temperature_stats,
     compute_vigilance,
+    fetch_climate_bundle,
     fetch_forecast,
-    fetch_historical_daily,
     geocode_city,
     monthly_means_from_daily,
     to_daily_df,
     to_hourly_df,
 )
-from src.weather_codes import code_to_visual
+from src.vigilance import Vigilance
+from src.weather_codes import DAY_ICONS, ICON_TABLE, UNKNOWN_ROW, code_to_visual
 
 
 # -----------------------------
@@ -75,165 +80,200 @@ st.set_page_config(
 )
 
 
-@st.cache_data(ttl=60 * 60)
-def cached_geocode(query: str, country_code: Optional[str]) -> list[Location]:
-    return geocode_city(query, country_code=country_code)
+# Place names do not move: keep lookups for a day, and keep the spinner out of
+# the way since the sidebar reruns on every keystroke-commit.
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def cached_geocode(name: str, country_code: Optional[str], language: str = "fr") -> list[Location]:
+    return geocode_city(name, country_code=country_code, language=language)
 
 
+# Forecast/historical payloads are shared by reference (no pickling on a hit),
+# so callers must treat them as read-only. The cache key is the rounded
+# coordinates: `_location` is not hashed, it only names the saved files.
+@st.cache_resource(ttl=10 * 60)
+def cached_forecast(latitude: float, longitude: float, timezone: str, _location: Location) -> Dict[str, Any]:
+    return fetch_forecast(_location)
+
+
+@st.cache_resource(ttl=12 * 60 * 60)
+def cached_climate_bundle(
+    latitude: float, longitude: float, timezone: str, end: date, _location: Location
+) -> Dict[str, pd.DataFrame]:
+    return fetch_climate_bundle(_location, end=end)
+
+
+def _cache_key(location: Location) -> tuple[float, float, str]:
+    return round(location.latitude, 3), round(location.longitude, 3), location.timezone
+
+
+# Tidy tables derived from a cached forecast: rebuilt once per forecast
+# (location + `current.time`) instead of on every widget interaction.
 @st.cache_data(ttl=10 * 60)
-def cached_forecast(location: Location) -> Dict[str, Any]:
-    return fetch_forecast(location)
+def cached_hourly_df(latitude: float, longitude: float, forecast_time: Optional[str], _forecast: Dict[str, Any]) -> pd.DataFrame:
+    return to_hourly_df(_forecast)
 
 
-@st.cache_data(ttl=12 * 60 * 60)
-def cached_historical_daily(location: Location, start: date, end: date) -> pd.DataFrame:
-    return fetch_historical_daily(location, start=start, end=end)
+@st.cache_data(ttl=10 * 60)
+def cached_daily_df(latitude: float, longitude: float, forecast_time: Optional[str], _forecast: Dict[str, Any]) -> pd.DataFrame:
+    return to_daily_df(_forecast)
 
 
-RAIN_CODES = {51, 53, 55, 56, 57, 61, 63, 65, 66, 67, 80, 81, 82}
-SNOW_CODES = {71, 73, 75, 77, 85, 86}
-FOG_CODES = {45, 48}
-STORM_CODES = {95, 96, 99}
-CLOUDY_CODES = {2, 3}
+@st.cache_data(ttl=10 * 60)
+def cached_vigilance(latitude: float, longitude: float, forecast_time: Optional[str], _forecast: Dict[str, Any]) -> Vigilance:
+    return compute_vigilance(_forecast)
 
 
-def _theme_from_conditions(weather_code: Optional[int], is_day: Optional[int]) -> str:
-    """Pick a theme name from current conditions."""
+RAIN_CODES = frozenset({51, 53, 55, 56, 57, 61, 63, 65, 66, 67, 80, 81, 82})
+SNOW_CODES = frozenset({71, 73, 75, 77, 85, 86})
+FOG_CODES = frozenset({45, 48})
+STORM_CODES = frozenset({95, 96, 99})
+CLOUDY_CODES = frozenset({2, 3})
 
-    code = int(weather_code) if weather_code is not None else None
-    is_night = is_day is not None and int(is_day) == 0
 
-    if code in STORM_CODES:
-        return "storm_night" if is_night else "storm_day"
-    if code in SNOW_CODES:
-        return "snow_night" if is_night else "snow_day"
-    if code in RAIN_CODES:
-        return "rain_night" if is_night else "rain_day"
-    if code in FOG_CODES:
-        return "fog_night" if is_night else "fog_day"
-    if code in CLOUDY_CODES:
-        return "cloudy_night" if is_night else "cloudy_day"
-    return "clear_night" if is_night else "clear_day"
+# weather_code -> theme category (codes missing from the table are "clear")
+_CODE_TO_CATEGORY: Dict[int, str] = (
+    {c: "cloudy" for c in CLOUDY_CODES}
+    | {c: "fog" for c in FOG_CODES}
+    | {c: "rain" for c in RAIN_CODES}
+    | {c: "snow" for c in SNOW_CODES}
+    | {c: "storm" for c in STORM_CODES}
+)
 
 
+def _theme_from_conditions(weather_code: Optional[int], is_day: Optional[int]) -> str:
+    """Pick a theme name from current conditions."""
 
-def inject_css(theme: str) -> None:
-    # --- Theme palette (cartoon-like backgrounds) ---
-    # Goal: mimic a modern mobile weather app (like the screenshot the user shared),
-    # with a "sky" background that changes with time + weather and has gentle animations.
-
-    palettes: Dict[str, Dict[str, str]] = {
-        "clear_day": {
-            "sky_top": "#76c8ff",
-            "sky_bottom": "#1f78b9",
-            "cloud": "rgba(255,255,255,0.92)",
-            "cloud_op": "0.35",
-            "stars_op": "0",
-            "sun_op": "1",
-            "moon_op": "0",
-        },
-        "cloudy_day": {
-            "sky_top": "#8bc6e6",
-            "sky_bottom": "#2d6f90",
-            "cloud": "rgba(255,255,255,0.94)",
-            "cloud_op": "0.70",
-            "stars_op": "0",
-            "sun_op": "0.55",
-            "moon_op": "0",
-        },
-        "rain_day": {
-            "sky_top": "#58798a",
-            "sky_bottom": "#1b2b34",
-            "cloud": "rgba(185,200,214,0.72)",
-            "cloud_op": "0.85",
-            "stars_op": "0",
-            "sun_op": "0",
-            "moon_op": "0",
-        },
-        "snow_day": {
-            "sky_top": "#a9ddff",
-            "sky_bottom": "#4e95b8",
-            "cloud": "rgba(255,255,255,0.90)",
-            "cloud_op": "0.72",
-            "stars_op": "0",
-            "sun_op": "0.25",
-            "moon_op": "0",
-        },
-        "fog_day": {
-            "sky_top": "#7f96a3",
-            "sky_bottom": "#2f3e47",
-            "cloud": "rgba(240,245,248,0.40)",
-            "cloud_op": "0.35",
-            "stars_op": "0",
-            "sun_op": "0",
-            "moon_op": "0",
-        },
-        "storm_day": {
-            "sky_top": "#2b3640",
-            "sky_bottom": "#0b1015",
-            "cloud": "rgba(150,165,180,0.70)",
-            "cloud_op": "0.90",
-            "stars_op": "0",
-            "sun_op": "0",
-            "moon_op": "0",
-        },
-        "clear_night": {
-            "sky_top": "#0b1f47",
-            "sky_bottom": "#05070f",
-            "cloud": "rgba(255,255,255,0.22)",
-            "cloud_op": "0.18",
-            "stars_op": "0.62",
-            "sun_op": "0",
-            "moon_op": "1",
-        },
-        "cloudy_night": {
-            "sky_top": "#0b1f47",
-            "sky_bottom": "#05070f",
-            "cloud": "rgba(255,255,255,0.26)",
-            "cloud_op": "0.45",
-            "stars_op": "0.20",
-            "sun_op": "0",
-            "moon_op": "0.65",
-        },
-        "rain_night": {
-            "sky_top": "#132434",
-            "sky_bottom": "#050a12",
-            "cloud": "rgba(175,190,205,0.55)",
-            "cloud_op": "0.82",
-            "stars_op": "0",
-            "sun_op": "0",
-            "moon_op": "0",
-        },
-        "snow_night": {
-            "sky_top": "#10244c",
-            "sky_bottom": "#05070f",
-            "cloud": "rgba(255,255,255,0.28)",
-            "cloud_op": "0.40",
-            "stars_op": "0.35",
-            "sun_op": "0",
-            "moon_op": "0.7",
-        },
-        "fog_night": {
-            "sky_top": "#1b2b34",
-            "sky_bottom": "#050a12",
-            "cloud": "rgba(255,255,255,0.18)",
-            "cloud_op": "0.20",
-            "stars_op": "0",
-            "sun_op": "0",
-            "moon_op": "0",
-        },
-        "storm_night": {
-            "sky_top": "#0a0f14",
-            "sky_bottom": "#020409",
-            "cloud": "rgba(170,185,200,0.45)",
-            "cloud_op": "0.90",
-            "stars_op": "0",
-            "sun_op": "0",
-            "moon_op": "0",
-        },
-    }
+    category = _CODE_TO_CATEGORY.get(int(weather_code), "clear") if weather_code is not None else "clear"
+    is_night = is_day is not None and int(is_day) == 0
+    return f"{category}_{'night' if is_night else 'day'}"
+
+
+
+# --- Theme palette (cartoon-like backgrounds) ---
+# Goal: mimic a modern mobile weather app (like the screenshot the user shared),
+# with a "sky" background that changes with time + weather and has gentle animations.
+
+_PALETTES: Dict[str, Dict[str, str]] = {
+    "clear_day": {
+        "sky_top": "#76c8ff",
+        "sky_bottom": "#1f78b9",
+        "cloud": "rgba(255,255,255,0.92)",
+        "cloud_op": "0.35",
+        "stars_op": "0",
+        "sun_op": "1",
+        "moon_op": "0",
+    },
+    "cloudy_day": {
+        "sky_top": "#8bc6e6",
+        "sky_bottom": "#2d6f90",
+        "cloud": "rgba(255,255,255,0.94)",
+        "cloud_op": "0.70",
+        "stars_op": "0",
+        "sun_op": "0.55",
+        "moon_op": "0",
+    },
+    "rain_day": {
+        "sky_top": "#58798a",
+        "sky_bottom": "#1b2b34",
+        "cloud": "rgba(185,200,214,0.72)",
+        "cloud_op": "0.85",
+        "stars_op": "0",
+        "sun_op": "0",
+        "moon_op": "0",
+    },
+    "snow_day": {
+        "sky_top": "#a9ddff",
+        "sky_bottom": "#4e95b8",
+        "cloud": "rgba(255,255,255,0.90)",
+        "cloud_op": "0.72",
+        "stars_op": "0",
+        "sun_op": "0.25",
+        "moon_op": "0",
+    },
+    "fog_day": {
+        "sky_top": "#7f96a3",
+        "sky_bottom": "#2f3e47",
+        "cloud": "rgba(240,245,248,0.40)",
+        "cloud_op": "0.35",
+        "stars_op": "0",
+        "sun_op": "0",
+        "moon_op": "0",
+    },
+    "storm_day": {
+        "sky_top": "#2b3640",
+        "sky_bottom": "#0b1015",
+        "cloud": "rgba(150,165,180,0.70)",
+        "cloud_op": "0.90",
+        "stars_op": "0",
+        "sun_op": "0",
+        "moon_op": "0",
+    },
+    "clear_night": {
+        "sky_top": "#0b1f47",
+        "sky_bottom": "#05070f",
+        "cloud": "rgba(255,255,255,0.22)",
+        "cloud_op": "0.18",
+        "stars_op": "0.62",
+        "sun_op": "0",
+        "moon_op": "1",
+    },
+    "cloudy_night": {
+        "sky_top": "#0b1f47",
+        "sky_bottom": "#05070f",
+        "cloud": "rgba(255,255,255,0.26)",
+        "cloud_op": "0.45",
+        "stars_op": "0.20",
+        "sun_op": "0",
+        "moon_op": "0.65",
+    },
+    "rain_night": {
+        "sky_top": "#132434",
+        "sky_bottom": "#050a12",
+        "cloud": "rgba(175,190,205,0.55)",
+        "cloud_op": "0.82",
+        "stars_op": "0",
+        "sun_op": "0",
+        "moon_op": "0",
+    },
+    "snow_night": {
+        "sky_top": "#10244c",
+        "sky_bottom": "#05070f",
+        "cloud": "rgba(255,255,255,0.28)",
+        "cloud_op": "0.40",
+        "stars_op": "0.35",
+        "sun_op": "0",
+        "moon_op": "0.7",
+    },
+    "fog_night": {
+        "sky_top": "#1b2b34",
+        "sky_bottom": "#050a12",
+        "cloud": "rgba(255,255,255,0.18)",
+        "cloud_op": "0.20",
+        "stars_op": "0",
+        "sun_op": "0",
+        "moon_op": "0",
+    },
+    "storm_night": {
+        "sky_top": "#0a0f14",
+        "sky_bottom": "#020409",
+        "cloud": "rgba(170,185,200,0.45)",
+        "cloud_op": "0.90",
+        "stars_op": "0",
+        "sun_op": "0",
+        "moon_op": "0",
+    },
+}
+
+
+@st.cache_data
+def _build_css(theme: str) -> str:
+    """Build the sky markup + the CSS variables of a theme + ``_STATIC_CSS``.
+
+    Only 12 themes exist, so the cache stays tiny and each rerun simply reuses
+    the precomputed string: the static rules are concatenated once per theme.
+    """
 
-    p = palettes.get(theme, palettes["clear_day"])
+    p = _PALETTES.get(theme, _PALETTES["clear_day"])
 
     # Pre-compute a few derived CSS values in Python.
     # (CSS calc() does not reliably support multiplication across browsers.)
@@ -267,9 +307,7 @@ def inject_css(theme: str) -> None:
 
     sky_class_attr = " ".join(sky_classes)
 
-    # Insert the decorative sky *behind* the Streamlit UI.
-    st.markdown(
-        f"""
+    return f"""
 <div class="{sky_class_attr}" aria-hidden="true">
   <div class="stars"></div>
   <div class="sun"></div>
@@ -287,63 +325,86 @@ def inject_css(theme: str) -> None:
   <div class="lightning"></div>
 </div>
 
+<style>
+:root {{
+  --sky-top: {p['sky_top']};
+  --sky-bottom: {p['sky_bottom']};
+  --cloud: {p['cloud']};
+  --cloud-op: {p['cloud_op']};
+  --cloud-op-1: {cloud_op_1};
+  --cloud-op-2: {cloud_op_2};
+  --cloud-op-3: {cloud_op_3};
+  --cloud-op-4: {cloud_op_4};
+  --cloud-op-5: {cloud_op_5};
+  --stars-op: {p['stars_op']};
+  --sun-op: {p['sun_op']};
+  --moon-op: {p['moon_op']};
+}}
+</style>
+{_STATIC_CSS}"""
+
+
+# Theme-independent stylesheet: every themed value is read from the CSS
+# variables emitted by _build_css, so this string needs no formatting and is
+# appended as-is to each cached theme string.
+_STATIC_CSS = """
 <style>
 /* Streamlit chrome:
    - hide the menu + footer
    - KEEP the header so the user can reopen the sidebar if it was collapsed
 */
-#MainMenu {{visibility: hidden;}}
-footer {{visibility: hidden;}}
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
 
 /* Keep header (sidebar toggle lives here), but make it visually invisible */
-header[data-testid="stHeader"] {{
+header[data-testid="stHeader"] {
   background: transparent;
   border-bottom: 0;
-}}
+}
 
 /* Ensure body doesn't paint over our animated sky */
-html, body {{
+html, body {
   background: transparent !important;
-}}
+}
 
 /* Global typography (no external fonts required) */
-html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {{
+html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {
   font-family: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji";
-}}
+}
 
 /* --- Animated background sky (cartoon style) --- */
-.sky {{
+.sky {
   position: fixed;
   inset: 0;
   /* Put the animated sky strictly behind all Streamlit layers (incl. sidebar). */
   z-index: -10;
   pointer-events: none;
   overflow: hidden;
-  background: linear-gradient(180deg, {p['sky_top']} 0%, {p['sky_bottom']} 100%);
+  background: linear-gradient(180deg, var(--sky-top) 0%, var(--sky-bottom) 100%);
   background-size: 140% 140%;
   animation: skyDrift 18s ease-in-out infinite alternate;
-}}
+}
 
-@keyframes skyDrift {{
-  from {{ background-position: 0% 0%; }}
-  to   {{ background-position: 100% 100%; }}
-}}
+@keyframes skyDrift {
+  from { background-position: 0% 0%; }
+  to   { background-position: 100% 100%; }
+}
 
 /* Subtle vignette */
-.sky::after {{
+.sky::after {
   content: "";
   position: absolute;
   inset: 0;
   background: radial-gradient(circle at 50% 40%, rgba(255,255,255,0.06) 0%, rgba(0,0,0,0.35) 75%);
   opacity: 0.9;
-}}
+}
 
 /* Stars layer */
-.stars {{
+.stars {
   position: absolute;
   inset: 0;
   display: none;
-  opacity: {p['stars_op']};
+  opacity: var(--stars-op);
   background-image:
     radial-gradient(1px 1px at 18px 22px, rgba(255,255,255,0.95) 0 60%, transparent 61%),
     radial-gradient(1px 1px at 90px 120px, rgba(255,255,255,0.85) 0 60%, transparent 61%),
@@ -353,63 +414,63 @@ html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {{
   background-size: 220px 220px;
   background-repeat: repeat;
   animation: starsDrift 90s linear infinite, starsTwinkle 5.5s ease-in-out infinite alternate;
-}}
+}
 
-.sky.stars-on .stars {{ display: block; }}
+.sky.stars-on .stars { display: block; }
 
-@keyframes starsTwinkle {{
-  from {{ filter: brightness(0.9); }}
-  to   {{ filter: brightness(1.25); }}
-}}
+@keyframes starsTwinkle {
+  from { filter: brightness(0.9); }
+  to   { filter: brightness(1.25); }
+}
 
-@keyframes starsDrift {{
-  from {{ transform: translateX(0px); }}
-  to   {{ transform: translateX(44px); }}
-}}
+@keyframes starsDrift {
+  from { transform: translateX(0px); }
+  to   { transform: translateX(44px); }
+}
 
 /* Sun */
-.sun {{
+.sun {
   position: absolute;
   width: 180px;
   height: 180px;
   border-radius: 50%;
   top: 6.5%;
   left: 7.5%;
-  opacity: {p['sun_op']};
+  opacity: var(--sun-op);
   display: none;
   background: radial-gradient(circle at 30% 30%, #fff6d6 0%, #ffd36e 35%, #ff9a1a 72%, #ff7a00 100%);
   box-shadow: 0 0 90px rgba(255, 190, 90, 0.42);
   animation: floatSlow 7s ease-in-out infinite;
-}}
+}
 
-.sun::after {{
+.sun::after {
   content: "";
   position: absolute;
   inset: -28px;
   border-radius: 50%;
   background: radial-gradient(circle, rgba(255,255,255,0.20) 0%, rgba(255,255,255,0.0) 60%);
   opacity: 0.9;
-}}
+}
 
-.sky.sun-on .sun {{ display: block; }}
+.sky.sun-on .sun { display: block; }
 
 /* Moon */
-.moon {{
+.moon {
   position: absolute;
   width: 160px;
   height: 160px;
   border-radius: 50%;
   top: 7.5%;
   left: 8.5%;
-  opacity: {p['moon_op']};
+  opacity: var(--moon-op);
   display: none;
   background: radial-gradient(circle at 35% 35%, #ffffff 0%, #f6f2d8 45%, #d9d4b8 100%);
   box-shadow: 0 0 70px rgba(255,255,255,0.18);
   overflow: hidden;
   animation: floatSlow 8s ease-in-out infinite;
-}}
+}
 
-.moon::after {{
+.moon::after {
   content: "";
   position: absolute;
   width: 160px;
@@ -417,72 +478,72 @@ html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {{
   border-radius: 50%;
   top: 10px;
   left: 52px;
-  background: linear-gradient(180deg, {p['sky_top']} 0%, {p['sky_bottom']} 100%);
-}}
+  background: linear-gradient(180deg, var(--sky-top) 0%, var(--sky-bottom) 100%);
+}
 
-.sky.moon-on .moon {{ display: block; }}
+.sky.moon-on .moon { display: block; }
 
-@keyframes floatSlow {{
-  0%   {{ transform: translateY(0px); }}
-  50%  {{ transform: translateY(-10px); }}
-  100% {{ transform: translateY(0px); }}
-}}
+@keyframes floatSlow {
+  0%   { transform: translateY(0px); }
+  50%  { transform: translateY(-10px); }
+  100% { transform: translateY(0px); }
+}
 
 /* Clouds (several independent elements, cartoon style) */
-.cloud {{
+.cloud {
   position: absolute;
   left: -38vw;
   top: 18%;
   width: 280px;
   height: 86px;
-  background: {p['cloud']};
+  background: var(--cloud);
   border-radius: 999px;
-  opacity: {p['cloud_op']};
+  opacity: var(--cloud-op);
   filter: blur(0.2px);
   animation: cloudDrift var(--dur, 62s) linear infinite;
   transform: translateX(0) scale(var(--s, 1));
-}}
+}
 
 .cloud::before,
-.cloud::after {{
+.cloud::after {
   content: "";
   position: absolute;
   background: inherit;
   border-radius: 50%;
-}}
+}
 
-.cloud::before {{
+.cloud::before {
   width: 48%;
   height: 150%;
   top: -70%;
   left: 12%;
-}}
+}
 
-.cloud::after {{
+.cloud::after {
   width: 58%;
   height: 175%;
   top: -95%;
   left: 42%;
-}}
+}
 
-.cloud.c1 {{ top: 18%; --dur: 58s; --s: 1.05; opacity: {cloud_op_1}; }}
-.cloud.c2 {{ top: 34%; --dur: 74s; --s: 0.92; opacity: {cloud_op_2}; }}
-.cloud.c3 {{ top: 52%; --dur: 82s; --s: 0.78; opacity: {cloud_op_3}; }}
-.cloud.c4 {{ top: 14%; --dur: 96s; --s: 0.70; opacity: {cloud_op_4}; }}
-.cloud.c5 {{ top: 60%; --dur: 64s; --s: 0.88; opacity: {cloud_op_5}; }}
+.cloud.c1 { top: 18%; --dur: 58s; --s: 1.05; opacity: var(--cloud-op-1); }
+.cloud.c2 { top: 34%; --dur: 74s; --s: 0.92; opacity: var(--cloud-op-2); }
+.cloud.c3 { top: 52%; --dur: 82s; --s: 0.78; opacity: var(--cloud-op-3); }
+.cloud.c4 { top: 14%; --dur: 96s; --s: 0.70; opacity: var(--cloud-op-4); }
+.cloud.c5 { top: 60%; --dur: 64s; --s: 0.88; opacity: var(--cloud-op-5); }
 
-.cloud.c2 {{ animation-delay: -18s; }}
-.cloud.c3 {{ animation-delay: -38s; }}
-.cloud.c4 {{ animation-delay: -52s; }}
-.cloud.c5 {{ animation-delay: -26s; }}
+.cloud.c2 { animation-delay: -18s; }
+.cloud.c3 { animation-delay: -38s; }
+.cloud.c4 { animation-delay: -52s; }
+.cloud.c5 { animation-delay: -26s; }
 
-@keyframes cloudDrift {{
-  from {{ transform: translateX(0) translateY(0) scale(var(--s, 1)); }}
-  to   {{ transform: translateX(165vw) translateY(-12px) scale(var(--s, 1)); }}
-}}
+@keyframes cloudDrift {
+  from { transform: translateX(0) translateY(0) scale(var(--s, 1)); }
+  to   { transform: translateX(165vw) translateY(-12px) scale(var(--s, 1)); }
+}
 
 /* Rain */
-.rain {{
+.rain {
   position: absolute;
   inset: 0;
   display: none;
@@ -494,17 +555,17 @@ html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {{
     transparent 18px);
   background-size: 340px 340px;
   animation: rainFall 0.75s linear infinite;
-}}
+}
 
-.sky.rain-on .rain {{ display: block; }}
+.sky.rain-on .rain { display: block; }
 
-@keyframes rainFall {{
-  from {{ background-position: 0 0; }}
-  to   {{ background-position: -160px 420px; }}
-}}
+@keyframes rainFall {
+  from { background-position: 0 0; }
+  to   { background-position: -160px 420px; }
+}
 
 /* Snow */
-.snow {{
+.snow {
   position: absolute;
   inset: 0;
   display: none;
@@ -512,17 +573,17 @@ html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {{
   background-image: radial-gradient(rgba(255,255,255,0.90) 1.25px, transparent 1.35px);
   background-size: 95px 95px;
   animation: snowFall 12s linear infinite;
-}}
+}
 
-.sky.snow-on .snow {{ display: block; }}
+.sky.snow-on .snow { display: block; }
 
-@keyframes snowFall {{
-  from {{ background-position: 0 0; }}
-  to   {{ background-position: 0 420px; }}
-}}
+@keyframes snowFall {
+  from { background-position: 0 0; }
+  to   { background-position: 0 420px; }
+}
 
 /* Fog */
-.fog {{
+.fog {
   position: absolute;
   inset: -10% -10% -10% -10%;
   display: none;
@@ -533,87 +594,87 @@ html, body, [class*="css"], .stMarkdown, .stTextInput, .stSelectbox {{
     radial-gradient(circle at 50% 70%, rgba(255,255,255,0.14) 0 40%, transparent 65%);
   filter: blur(10px);
   animation: fogDrift 12s ease-in-out infinite alternate;
-}}
+}
 
-.sky.fog-on .fog {{ display: block; }}
+.sky.fog-on .fog { display: block; }
 
-@keyframes fogDrift {{
-  from {{ transform: translateX(-10px); }}
-  to   {{ transform: translateX(14px); }}
-}}
+@keyframes fogDrift {
+  from { transform: translateX(-10px); }
+  to   { transform: translateX(14px); }
+}
 
 /* Lightning */
-.lightning {{
+.lightning {
   position: absolute;
   inset: 0;
   display: none;
   background: rgba(255,255,255,0.12);
   opacity: 0;
   animation: lightningFlash 8s linear infinite;
-}}
+}
 
-.sky.lightning-on .lightning {{ display: block; }}
+.sky.lightning-on .lightning { display: block; }
 
-@keyframes lightningFlash {{
-  0%, 78%, 100% {{ opacity: 0; }}
-  80% {{ opacity: 0.35; }}
-  81% {{ opacity: 0.00; }}
-  83% {{ opacity: 0.48; }}
-  84% {{ opacity: 0.00; }}
-}}
+@keyframes lightningFlash {
+  0%, 78%, 100% { opacity: 0; }
+  80% { opacity: 0.35; }
+  81% { opacity: 0.00; }
+  83% { opacity: 0.48; }
+  84% { opacity: 0.00; }
+}
 
 /* --- Bring content above background --- */
-.stApp {{
+.stApp {
   background: transparent;
   color: rgba(255,255,255,0.96);
-}}
+}
 
 /* --- Bring content above background --- */
-[data-testid="stAppViewContainer"] {{
+[data-testid="stAppViewContainer"] {
   background: transparent;
   color: rgba(255,255,255,0.96);
-}}
+}
 
 /* Sidebar: keep it above everything (defensive z-index),
    but DO NOT override the collapsed transform state.
    Overriding aria-expanded="false" breaks the ability to collapse it. */
-section[data-testid="stSidebar"] {{
+section[data-testid="stSidebar"] {
   position: relative;
   z-index: 9999 !important;
-}}
+}
 
 /* Ensure sidebar content can scroll (some custom CSS can accidentally kill it). */
-section[data-testid="stSidebar"] > div:first-child {{
+section[data-testid="stSidebar"] > div:first-child {
   max-height: 100vh !important;
   overflow-y: auto !important;
   overflow-x: hidden !important;
-}}
+}
 
-section[data-testid="stSidebar"] [data-testid="stSidebarContent"] {{
+section[data-testid="stSidebar"] [data-testid="stSidebarContent"] {
   max-height: 100vh !important;
   overflow-y: auto !important;
-}}
+}
 
 /* Header (contains the sidebar toggle) should also stay on top */
-header[data-testid="stHeader"] {{
+header[data-testid="stHeader"] {
   z-index: 99999 !important;
-}}
+}
 
 /* Sidebar: dark glass panel */
-[data-testid="stSidebar"] > div:first-child {{
+[data-testid="stSidebar"] > div:first-child {
   background: rgba(12, 16, 22, 0.66);
   border-right: 1px solid rgba(255,255,255,0.08);
   backdrop-filter: blur(12px);
   -webkit-backdrop-filter: blur(12px);
-}}
+}
 
 /* Make the page feel like a mobile app */
-section.main > div {{
+section.main > div {
   padding-top: 1.2rem;
-}}
+}
 
 /* Glass cards */
-.glass {{
+.glass {
   background: rgba(255, 255, 255, 0.09);
   border: 1px solid rgba(255, 255, 255, 0.14);
   border-radius: 18px;
@@ -622,163 +683,188 @@ section.main > div {{
   -webkit-backdrop-filter: blur(12px);
   box-shadow: 0 16px 40px rgba(0,0,0,0.18);
   transition: transform 180ms ease, background 180ms ease;
-}}
+}
 
-.glass:hover {{
+.glass:hover {
   transform: translateY(-2px);
   background: rgba(255, 255, 255, 0.11);
-}}
+}
 
-.hero {{
+.hero {
   padding: 22px 22px;
-}}
+}
 
-.city {{
+.city {
   font-size: 1.05rem;
   letter-spacing: 0.2px;
   opacity: 0.95;
-}}
+}
 
-.desc {{
+.desc {
   font-size: 0.95rem;
   opacity: 0.78;
   margin-top: 2px;
-}}
+}
 
-.hero-top {{
+.hero-top {
   display:flex;
   justify-content: space-between;
   align-items: center;
   gap: 12px;
-}}
+}
 
-.hero-icon {{
+.hero-icon {
   font-size: 3.1rem;
   animation: floaty 4.5s ease-in-out infinite;
-}}
+}
 
-@keyframes floaty {{
-  0% {{ transform: translateY(0); }}
-  50% {{ transform: translateY(-7px); }}
-  100% {{ transform: translateY(0); }}
-}}
+@keyframes floaty {
+  0% { transform: translateY(0); }
+  50% { transform: translateY(-7px); }
+  100% { transform: translateY(0); }
+}
 
-.hero-temp {{
+.hero-temp {
   font-size: 4.2rem;
   font-weight: 700;
   line-height: 1;
   margin-top: 8px;
-}}
+}
 
-.hero-minmax {{
+.hero-minmax {
   margin-top: 6px;
   font-size: 0.95rem;
   opacity: 0.8;
-}}
+}
 
 /* Hourly scroll */
-.hourly-scroll {{
+.hourly-scroll {
   display:flex;
   gap: 10px;
   overflow-x: auto;
   padding-bottom: 6px;
-}}
-.hourly-scroll::-webkit-scrollbar {{ height: 7px; }}
-.hourly-scroll::-webkit-scrollbar-thumb {{
+}
+.hourly-scroll::-webkit-scrollbar { height: 7px; }
+.hourly-scroll::-webkit-scrollbar-thumb {
   background: rgba(255,255,255,0.22);
   border-radius: 999px;
-}}
+}
 
-.hour-card {{
+.hour-card {
   min-width: 86px;
   padding: 12px 10px;
   border-radius: 16px;
   background: rgba(255,255,255,0.09);
   border: 1px solid rgba(255,255,255,0.12);
   text-align: center;
-}}
-.hour-time {{ font-size: 0.9rem; opacity: 0.82; }}
-.hour-icon {{ font-size: 1.5rem; margin: 6px 0; }}
-.hour-temp {{ font-size: 1.1rem; font-weight: 650; }}
-.hour-pp {{ font-size: 0.78rem; opacity: 0.7; margin-top: 4px; }}
+}
+.hour-time { font-size: 0.9rem; opacity: 0.82; }
+.hour-icon { font-size: 1.5rem; margin: 6px 0; }
+.hour-temp { font-size: 1.1rem; font-weight: 650; }
+.hour-pp { font-size: 0.78rem; opacity: 0.7; margin-top: 4px; }
 
 /* Daily list */
-.daily-row {{
+.daily-row {
   display:flex;
   align-items:center;
   justify-content: space-between;
   padding: 10px 4px;
   border-bottom: 1px solid rgba(255,255,255,0.09);
-}}
-.daily-row:last-child {{ border-bottom: none; }}
-.daily-left {{ display:flex; align-items:center; gap: 10px; }}
-.daily-day {{ width: 64px; opacity: 0.9; }}
-.daily-icon {{ font-size: 1.3rem; }}
-.daily-right {{ opacity: 0.92; }}
-.daily-min {{ opacity: 0.7; margin-left: 10px; }}
+}
+.daily-row:last-child { border-bottom: none; }
+.daily-left { display:flex; align-items:center; gap: 10px; }
+.daily-day { width: 64px; opacity: 0.9; }
+.daily-icon { font-size: 1.3rem; }
+.daily-right { opacity: 0.92; }
+.daily-min { opacity: 0.7; margin-left: 10px; }
 
 /* Vigilance badge */
-.badge {{
+.badge {
   display:inline-block;
   padding: 6px 10px;
   border-radius: 999px;
   font-size: 0.85rem;
   border: 1px solid rgba(255,255,255,0.18);
   background: rgba(255,255,255,0.08);
-}}
+}
 
-.v-verte {{ background: rgba(0, 200, 120, 0.18); }}
-.v-jaune {{ background: rgba(255, 215, 0, 0.18); }}
-.v-orange {{ background: rgba(255, 140, 0, 0.18); }}
-.v-rouge {{ background: rgba(255, 70, 70, 0.18); }}
+.v-verte { background: rgba(0, 200, 120, 0.18); }
+.v-jaune { background: rgba(255, 215, 0, 0.18); }
+.v-orange { background: rgba(255, 140, 0, 0.18); }
+.v-rouge { background: rgba(255, 70, 70, 0.18); }
 
 /* Small helper text */
-.muted {{ opacity: 0.72; }}
+.muted { opacity: 0.72; }
 
 /* Tabs: mobile segmented control (no emojis in the tab titles) */
-.stTabs [data-baseweb="tab-list"] {{
+.stTabs [data-baseweb="tab-list"] {
   gap: 6px;
-}}
-.stTabs [data-baseweb="tab"] {{
+}
+.stTabs [data-baseweb="tab"] {
   height: 40px;
   padding-left: 14px;
   padding-right: 14px;
   border-radius: 999px;
   background: rgba(255,255,255,0.08);
   border: 1px solid rgba(255,255,255,0.12);
-}}
-.stTabs [aria-selected="true"] {{
+}
+.stTabs [aria-selected="true"] {
   background: rgba(255,255,255,0.16);
   border: 1px solid rgba(255,255,255,0.22);
-}}
+}
 </style>
-""",
-        unsafe_allow_html=True,
-    )
+"""
 
 
-def _format_day_fr(ts: pd.Timestamp) -> str:
-    # Monday=0
-    days = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
-    return days[int(ts.dayofweek)]
+def inject_css(theme: str) -> None:
+    # Insert the decorative sky *behind* the Streamlit UI.
+    st.markdown(_build_css(theme), unsafe_allow_html=True)
 
 
-def _format_hour_fr(ts: pd.Timestamp) -> str:
-    return ts.strftime("%Hh")
+# HTML templates for the hourly cards / daily rows (filled with str.format).
+_HOUR_TPL = """
+<div class="hour-card">
+  <div class="hour-time">{hour}</div>
+  <div class="hour-icon">{icon}</div>
+  <div class="hour-temp">{temp}°</div>
+  <div class="hour-pp">Précip. {pp}%</div>
+</div>
+"""
 
-def _format_day_date_fr(ts: pd.Timestamp) -> str:
-    jours = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
-    mois = [
-        "janv.", "févr.", "mars", "avr.", "mai", "juin",
-        "juil.", "août", "sept.", "oct.", "nov.", "déc."
-    ]
-    ts = pd.to_datetime(ts)
-    return f"{jours[ts.dayofweek]} {ts.day} {mois[ts.month - 1]}"
+_DAILY_TPL = """
+<div class="daily-row">
+  <div class="daily-left">
+    <div class="daily-day">{dow} {day} {month}</div>
+    <div class="daily-icon">{icon}</div>
+    <div class="muted">Précip. {pp}%</div>
+  </div>
+  <div class="daily-right">
+    <span>{hi}°</span>
+    <span class="daily-min">{lo}°</span>
+  </div>
+</div>
+"""
+
+
+# French day/month names (Monday=0, January=0).
+_JOURS_COURTS = ("Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim")
+_JOURS_LONGS = ("Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche")
+_MOIS_COURTS = (
+    "janv.", "févr.", "mars", "avr.", "mai", "juin",
+    "juil.", "août", "sept.", "oct.", "nov.", "déc.",
+)
+_MOIS_LONGS = (
+    "janvier", "février", "mars", "avril", "mai", "juin",
+    "juillet", "août", "septembre", "octobre", "novembre", "décembre",
+)
+
+# numpy versions for vectorized (fancy-index) formatting
+_JOURS_ARR = np.array(_JOURS_COURTS)
+_MOIS_ARR = np.array(_MOIS_COURTS)
 
 
-def _month_label_fr(m: int) -> str:
-    mois = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", "Juil", "Aoû", "Sep", "Oct", "Nov", "Déc"]
-    return mois[m - 1] if 1 <= m <= 12 else str(m)
+def _format_day_fr(ts: pd.Timestamp) -> str:
+    return _JOURS_COURTS[int(ts.dayofweek)]
 
 
 def _safe_round(x: Any) -> str:
@@ -791,14 +877,168 @@ def _safe_round(x: Any) -> str:
         return str(int(round(float(x))))
     except Exception:
         return "–"
-    
+
+
+def _next_hours(df_hourly: pd.DataFrame, now: pd.Timestamp, n: int) -> pd.DataFrame:
+    """Return the `n` hourly rows starting at `now`.
+
+    Open‑Meteo timestamps are sorted, so a binary search replaces the
+    boolean mask over the whole frame.
+    """
+
+    i = int(np.searchsorted(df_hourly["time"].to_numpy(), now.to_datetime64(), side="left"))
+    return df_hourly.iloc[i : i + n]
+
+
+def _vec_icons(codes: pd.Series, is_day: pd.Series | int = 1) -> np.ndarray:
+    """Vectorized ``code_to_visual(code, is_day).icon`` through ICON_TABLE."""
+
+    c = pd.to_numeric(codes, errors="coerce").to_numpy(dtype=float)
+    rows = np.where((c >= 0) & (c < UNKNOWN_ROW), np.nan_to_num(c), UNKNOWN_ROW).astype(int)
+    cols = (pd.to_numeric(pd.Series(is_day, index=codes.index), errors="coerce").fillna(1) != 0).to_numpy(dtype=int)
+    return ICON_TABLE[rows, cols]
+
+
+def _vec_round(values: pd.Series) -> np.ndarray:
+    """Vectorized :func:`_safe_round` for a whole column."""
+
+    a = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    return np.where(np.isnan(a), "–", np.rint(np.nan_to_num(a)).astype(int).astype(str))
+
+
 def _format_date_fr(d: date) -> str:
-    jours = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
-    mois = [
-        "janvier", "février", "mars", "avril", "mai", "juin",
-        "juillet", "août", "septembre", "octobre", "novembre", "décembre",
-    ]
-    return f"{jours[d.weekday()]} {d.day} {mois[d.month - 1]} {d.year}"
+    return f"{_JOURS_LONGS[d.weekday()]} {d.day} {_MOIS_LONGS[d.month - 1]} {d.year}"
+
+
+# -----------------------------
+# Charts
+# -----------------------------
+
+# Layout shared by every chart; each chart only overrides what differs.
+BASE_LAYOUT: Dict[str, Any] = dict(
+    height=360,
+    margin=dict(l=10, r=10, t=10, b=10),
+    template="plotly_dark",
+    hovermode="x unified",
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+    xaxis=dict(showgrid=True),
+    yaxis=dict(title="°C", showgrid=True, zeroline=False),
+)
+
+
+def _line_trace(
+    x: Any,
+    y: Any,
+    *,
+    name: str,
+    color: str,
+    hovertemplate: str,
+    mode: str = "lines+markers",
+    dash: Optional[str] = None,
+) -> go.Scatter:
+    import plotly.graph_objects as go
+
+    line: Dict[str, Any] = dict(color=color, width=2)
+    if dash:
+        line["dash"] = dash
+    marker = dict(color=color) if "markers" in mode else None
+    return go.Scatter(x=x, y=y, mode=mode, name=name, line=line, marker=marker, hovertemplate=hovertemplate)
+
+
+def _line_chart(
+    x: Any,
+    y: Any,
+    *,
+    height: int = 360,
+    xaxis: Optional[Dict[str, Any]] = None,
+    **trace: Any,
+) -> go.Figure:
+    """°C line chart with one trace (see `_line_trace`) on `BASE_LAYOUT`."""
+
+    import plotly.graph_objects as go
+
+    layout = {**BASE_LAYOUT, "height": height}
+    if xaxis:
+        layout["xaxis"] = {**BASE_LAYOUT["xaxis"], **xaxis}
+    fig = go.Figure(layout=layout)
+    fig.add_trace(_line_trace(x, y, **trace))
+    return fig
+
+
+# Building a Plotly figure (template expansion + validation) costs far more
+# than serialising it, and the figures only depend on cached data: build each
+# one once per dataset and share it by reference (st.plotly_chart does not
+# mutate it). Serialisation then goes through plotly's "auto" JSON engine,
+# i.e. orjson, which is in requirements.txt.
+@st.cache_resource(ttl=10 * 60, show_spinner=False)
+def cached_forecast_fig(
+    latitude: float, longitude: float, forecast_time: Optional[str], _df_hourly: pd.DataFrame
+) -> go.Figure:
+    now = pd.to_datetime(forecast_time) if forecast_time else _df_hourly["time"].min()
+
+    df_48 = _next_hours(_df_hourly, now, 48)
+
+    temp = pd.to_numeric(df_48.get("temperature_2m"), errors="coerce").to_numpy()
+    feel = pd.to_numeric(df_48.get("apparent_temperature"), errors="coerce").to_numpy()
+
+    fig = _line_chart(
+        df_48["time"], temp,
+        name="Température (°C)",
+        color="#00E5FF",
+        hovertemplate="%{x|%a %d %b · %Hh}<br>Température: %{y:.1f}°C<extra></extra>",
+        xaxis=dict(tickformat="%Hh", dtick=3 * 60 * 60 * 1000),
+    )
+    fig.add_trace(_line_trace(
+        df_48["time"], feel,
+        name="Ressenti (°C)",
+        color="#FFB300",
+        dash="dash",
+        hovertemplate="%{x|%a %d %b · %Hh}<br>Ressenti: %{y:.1f}°C<extra></extra>",
+    ))
+    fig.add_vline(x=now, line_dash="dot", opacity=0.7)
+    return fig
+
+
+@st.cache_resource(ttl=12 * 60 * 60, show_spinner=False)
+def cached_climate_30d_fig(
+    latitude: float, longitude: float, timezone: str, end: date, _df_plot: pd.DataFrame
+) -> go.Figure:
+    return _line_chart(
+        _df_plot["date"], _df_plot["tmean"],
+        name="T° moyenne (°C)",
+        color="#7C4DFF",
+        hovertemplate="%{x|%a %d %b %Y}<br>T° moyenne: %{y:.1f}°C<extra></extra>",
+        xaxis=dict(tickformat="%d %b"),
+    )
+
+
+@st.cache_resource(ttl=12 * 60 * 60, show_spinner=False)
+def cached_climate_12m_fig(
+    latitude: float, longitude: float, timezone: str, end: date, _month12: pd.DataFrame
+) -> go.Figure:
+    # monthly_means_from_daily returns datetime months, sorted, without NaN.
+    return _line_chart(
+        _month12["month"], _month12["tmean"],
+        name="T° moyenne mensuelle (°C)",
+        color="#00C853",
+        hovertemplate="%{x}<br>T°: %{y:.1f}°C<extra></extra>",
+        height=320,
+    )
+
+
+@st.cache_resource(ttl=12 * 60 * 60, show_spinner=False)
+def cached_climate_5y_fig(
+    latitude: float, longitude: float, timezone: str, end: date, _month5y: pd.DataFrame
+) -> go.Figure:
+    return _line_chart(
+        _month5y["month"], _month5y["tmean"],
+        name="Normale approx (°C)",
+        color="#FF5252",
+        hovertemplate="%{x|%b %Y}<br>T°: %{y:.1f}°C<extra></extra>",
+        mode="lines",
+        height=320,
+        xaxis=dict(tickformat="%b\n%Y", dtick="M6"),
+    )
 
 
 
@@ -806,8 +1046,8 @@ def _format_date_fr(d: date) -> str:
 # Sidebar (city selection)
 # -----------------------------
 
-# Default list (France-first) comes from the data layer.
-DEFAULT_FAVORITES = list(DEFAULT_FAVORITES_FR)
+# Default list (France-first) comes from the data layer (immutable tuple).
+DEFAULT_FAVORITES: tuple[str, ...] = DEFAULT_FAVORITES_FR
 
 if "favorites" not in st.session_state:
     st.session_state.favorites = list(DEFAULT_FAVORITES)
@@ -831,7 +1071,14 @@ def _use_popular_city() -> None:
     st.session_state.city_query = st.session_state.popular_city
 
 
-with st.sidebar:
+@st.fragment
+def _sidebar_fragment() -> None:
+    """Sidebar widgets, rerun on their own when the user interacts with them.
+
+    The selected location is published in ``st.session_state["location"]``;
+    the rest of the page is only rerun when that location changes.
+    """
+
     # ⚠️ Reset AVANT de créer les widgets
     if st.session_state.reset_favs:
         st.session_state.favorites = list(DEFAULT_FAVORITES)
@@ -861,9 +1108,12 @@ with st.sidebar:
     city_query = st.text_input("Rechercher une ville", key="city_query")
     geo_results = cached_geocode(city_query, country_code) if city_query else []
     if geo_results:
-        labels = [loc.label for loc in geo_results]
-        selected_label = st.selectbox("Résultats", labels, index=0)
-        location = geo_results[labels.index(selected_label)]
+        # First candidate wins for duplicated labels (same as the former list.index).
+        by_label: Dict[str, Location] = {}
+        for loc in geo_results:
+            by_label.setdefault(loc.label, loc)
+        selected_label = st.selectbox("Résultats", list(by_label), index=0)
+        location = by_label[selected_label]
     else:
         # Fallback to Paris coordinates if geocoding fails
         location = Location(
@@ -896,27 +1146,40 @@ with st.sidebar:
     st.markdown("---")
     st.caption("Données météo : Open-Meteo (API)\n\nCarte : Windy embed")
 
+    previous = st.session_state.get("location")
+    st.session_state.location = location
+    if previous is not None and previous != location:
+        st.rerun()
+
+
+with st.sidebar:
+    _sidebar_fragment()
+
+location: Location = st.session_state.location
+
 
 # -----------------------------
 # Data loading
 # -----------------------------
 
-forecast = cached_forecast(location)
-current = (forecast.get("current") or {}) if forecast else {}
+forecast = cached_forecast(*_cache_key(location), location)
+if not forecast:
+    # Transient error page: skip the themed background/CSS entirely.
+    st.error("Impossible de récupérer la météo pour le moment. Réessayez.")
+    st.stop()
+
+current = forecast.get("current") or {}
 
 current_code = current.get("weather_code")
 current_is_day = current.get("is_day")
 theme = _theme_from_conditions(current_code, current_is_day)
 inject_css(theme)
 
-if not forecast:
-    st.error("Impossible de récupérer la météo pour le moment. Réessayez.")
-    st.stop()
-
 
-df_hourly = to_hourly_df(forecast)
-df_daily = to_daily_df(forecast)
-vigilance = compute_vigilance(forecast)
+forecast_key = (round(location.latitude, 3), round(location.longitude, 3), current.get("time"))
+df_hourly = cached_hourly_df(*forecast_key, forecast)
+df_daily = cached_daily_df(*forecast_key, forecast)
+vigilance = cached_vigilance(*forecast_key, forecast)
 
 
 # -----------------------------
@@ -924,6 +1187,8 @@ vigilance = compute_vigilance(forecast)
 # -----------------------------
 
 visual = code_to_visual(current_code, current_is_day)
+# ZoneInfo keeps its own per-key cache, so this does not re-read tzdata.
+# `today_local` is reused by the "Prévisions" tab.
 tz = ZoneInfo(location.timezone) if getattr(location, "timezone", None) else None
 today_local = datetime.now(tz).date() if tz else date.today()
 today_str = _format_date_fr(today_local)
@@ -962,29 +1227,30 @@ tab_today, tab_forecast, tab_map, tab_climate = st.tabs(["Aujourd’hui", "Prév
 
 
 with tab_today:
-    st.markdown("### Prochaines heures")
-
+    # Headers + HTML cards are sent as a single markdown element.
     if df_hourly.empty:
+        st.markdown("### Prochaines heures")
         st.info("Données horaires indisponibles.")
+        parts = ["### Détails"]
     else:
         now = pd.to_datetime(current.get("time")) if current.get("time") else df_hourly["time"].min()
-        df_next = df_hourly[df_hourly["time"] >= now].head(14).copy()
-
-        cards = []
-        for _, r in df_next.iterrows():
-            icon = code_to_visual(r.get("weather_code"), r.get("is_day")).icon
-            cards.append(
-                f"""
-<div class="hour-card">
-  <div class="hour-time">{_format_hour_fr(pd.to_datetime(r['time']))}</div>
-  <div class="hour-icon">{icon}</div>
-  <div class="hour-temp">{_safe_round(r.get('temperature_2m'))}°</div>
-  <div class="hour-pp">Précip. {_safe_round(r.get('precipitation_probability'))}%</div>
-</div>
-"""
-            )
-
-        st.markdown(
+        df_next = _next_hours(df_hourly, now, 14)
+
+        hours = df_next["time"].dt.strftime("%Hh").to_numpy()
+        # Optional hourly variables may be missing from the payload: NaN gives
+        # the "unknown" icon, a day icon and "–", like ``r.get(...)`` did.
+        missing = pd.Series(np.nan, index=df_next.index)
+        icons = _vec_icons(df_next.get("weather_code", missing), df_next.get("is_day", missing))
+        temps = _vec_round(df_next.get("temperature_2m", missing))
+        pps = _vec_round(df_next.get("precipitation_probability", missing))
+
+        cards = [
+            _HOUR_TPL.format(hour=hour, icon=icon, temp=temp, pp=pp)
+            for hour, icon, temp, pp in zip(hours, icons, temps, pps)
+        ]
+
+        parts = [
+            "### Prochaines heures",
             f"""
 <div class="glass">
   <div class="hourly-scroll">
@@ -992,10 +1258,10 @@ with tab_today:
   </div>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
+            "### Détails",
+        ]
 
-    st.markdown("### Détails")
+    st.markdown("\n\n".join(parts), unsafe_allow_html=True)
     col1, col2, col3, col4 = st.columns(4)
 
     col1.metric("Humidité", f"{_safe_round(current.get('relative_humidity_2m'))}%")
@@ -1005,106 +1271,53 @@ with tab_today:
 
 
 with tab_forecast:
-    st.markdown("### Prochains jours")
     if df_daily.empty:
+        st.markdown("### Prochains jours")
         st.info("Données journalières indisponibles.")
     else:
-        # Date locale (même logique que la hero card)
-        tz = ZoneInfo(location.timezone) if getattr(location, "timezone", None) else None
-        today_local = datetime.now(tz).date() if tz else date.today()
-
-        # df_daily["time"] -> normaliser en date
-        df_daily2 = df_daily.copy()
-        df_daily2["day"] = pd.to_datetime(df_daily2["time"]).dt.date
-
-        # Garder uniquement aujourd'hui et les jours futurs, puis prendre les 7 prochains
-        df_daily_next = df_daily2[df_daily2["day"] > today_local].head(7)
-
-        rows = []
-        for _, r in df_daily_next.iterrows():
-            day = _format_day_date_fr(pd.to_datetime(r["time"]))
-            icon = code_to_visual(r.get("weather_code")).icon
-            tmax = _safe_round(r.get("temperature_2m_max"))
-            tmin = _safe_round(r.get("temperature_2m_min"))
-            pmax = _safe_round(r.get("precipitation_probability_max"))
-            rows.append(
-                f"""
-<div class="daily-row">
-  <div class="daily-left">
-    <div class="daily-day">{day}</div>
-    <div class="daily-icon">{icon}</div>
-    <div class="muted">Précip. {pmax}%</div>
-  </div>
-  <div class="daily-right">
-    <span>{tmax}°</span>
-    <span class="daily-min">{tmin}°</span>
-  </div>
-</div>
-"""
-            )
-
-
-        st.markdown(
+        # today_local : même date locale que la hero card (calculée une seule fois)
+        # Garder uniquement les jours futurs (comparaison au jour près), puis prendre les 7 prochains
+        days_d = df_daily["time"].to_numpy().astype("datetime64[D]")
+        df_daily_next = df_daily[days_d > np.datetime64(today_local, "D")].head(7)
+
+        t = df_daily_next["time"]
+        dows = _JOURS_ARR[t.dt.dayofweek.to_numpy()]
+        days = t.dt.day.to_numpy()
+        months = _MOIS_ARR[t.dt.month.to_numpy() - 1]
+        icons = df_daily_next["weather_code"].map(DAY_ICONS).fillna("❓").to_numpy()
+
+        tmax = _vec_round(df_daily_next["temperature_2m_max"])
+        tmin = _vec_round(df_daily_next["temperature_2m_min"])
+        pmax = _vec_round(df_daily_next["precipitation_probability_max"])
+
+        rows = [
+            _DAILY_TPL.format(dow=dow, day=day, month=month, icon=icon, hi=hi, lo=lo, pp=pp)
+            for dow, day, month, icon, hi, lo, pp in zip(dows, days, months, icons, tmax, tmin, pmax)
+        ]
+
+        parts = [
+            "### Prochains jours",
             f"""
 <div class="glass">
   {''.join(rows)}
 </div>
 """,
-            unsafe_allow_html=True,
-        )
+            "### Température (48h)",
+        ]
+        st.markdown("\n\n".join(parts), unsafe_allow_html=True)
 
-        st.markdown("### Température (48h)")
         if not df_hourly.empty:
-            now = pd.to_datetime(current.get("time")) if current.get("time") else pd.to_datetime(df_hourly["time"].min())
-
-            df_48 = df_hourly.copy()
-            df_48["time"] = pd.to_datetime(df_48["time"])
-            df_48 = df_48[df_48["time"] >= now].head(48).copy()
-
-            temp = pd.to_numeric(df_48.get("temperature_2m"), errors="coerce")
-            feel = pd.to_numeric(df_48.get("apparent_temperature"), errors="coerce")
-
-            fig = go.Figure()
-
-            fig.add_trace(go.Scatter(
-                x=df_48["time"], y=temp,
-                mode="lines+markers",
-                name="Température (°C)",
-                line=dict(color="#00E5FF", width=2),     # <- couleur 1
-                marker=dict(color="#00E5FF"),
-                hovertemplate="%{x|%a %d %b · %Hh}<br>Température: %{y:.1f}°C<extra></extra>",
-            ))
-
-            fig.add_trace(go.Scatter(
-                x=df_48["time"], y=feel,
-                mode="lines+markers",
-                name="Ressenti (°C)",
-                line=dict(color="#FFB300", width=2, dash="dash"),  # <- couleur 2
-                marker=dict(color="#FFB300"),
-                hovertemplate="%{x|%a %d %b · %Hh}<br>Ressenti: %{y:.1f}°C<extra></extra>",
-            ))
-
-            fig.add_vline(x=now, line_dash="dot", opacity=0.7)
-
-            fig.update_layout(
-                height=360,
-                margin=dict(l=10, r=10, t=10, b=10),
-                template="plotly_dark",
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-                hovermode="x unified",
-            )
-
-            fig.update_xaxes(tickformat="%Hh", dtick=3 * 60 * 60 * 1000, showgrid=True)
-            fig.update_yaxes(title="°C", showgrid=True, zeroline=False)
-
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_forecast_fig(*forecast_key, df_hourly), use_container_width=True)
         else:
             st.info("Données horaires indisponibles.")
 
 
 
 
-with tab_map:
+@st.fragment
+def _render_map(location: Location) -> None:
+    """Map tab: the layer/zoom widgets only rerun this fragment, not the page."""
+
     st.markdown("### Satellite / Radar")
 
     overlay_label = st.selectbox(
@@ -1137,20 +1350,25 @@ with tab_map:
     st.caption("La carte est intégrée via le widget Windy (embed).")
 
 
+with tab_map:
+    _render_map(location)
+
+
 
 with tab_climate:
+    # The 3 historical windows (30 days, 12 months, 5 years) are fetched together.
+    end = date.today()
+    climate = cached_climate_bundle(*_cache_key(location), end, location)
+
     st.markdown("### Analyse rapide")
 
     # 30 days historical daily for small stats
-    end = date.today()
-    start = end - timedelta(days=30)
-    hist = cached_historical_daily(location, start, end)
+    hist = climate["30d"]
 
     if hist.empty:
         st.info("Historique indisponible pour cette localisation.")
     else:
-        hist = hist.copy()
-        hist["tmean"] = (pd.to_numeric(hist["tmax"], errors="coerce") + pd.to_numeric(hist["tmin"], errors="coerce")) / 2.0
+        # `tmean` comes with the archive data (no copy of the cached frame).
         stats = compute_temperature_stats(hist["tmean"])
 
         col1, col2, col3, col4 = st.columns(4)
@@ -1161,130 +1379,35 @@ with tab_climate:
             col4.metric("Volatilité", f"{stats.std:.1f}")
 
         st.markdown("#### Température moyenne journalière (30 jours)")
-        df_plot = hist[["date", "tmean"]].dropna().copy()
-        df_plot["date"] = pd.to_datetime(df_plot["date"])
-        df_plot["tmean"] = pd.to_numeric(df_plot["tmean"], errors="coerce")
-        df_plot = df_plot.dropna().sort_values("date")
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df_plot["date"],
-            y=df_plot["tmean"],
-            mode="lines+markers",
-            name="T° moyenne (°C)",
-            line=dict(color="#7C4DFF", width=2),   # <- couleur
-            marker=dict(color="#7C4DFF"),
-            hovertemplate="%{x|%a %d %b %Y}<br>T° moyenne: %{y:.1f}°C<extra></extra>",
-        ))
-
-        fig.update_layout(
-            height=360,
-            margin=dict(l=10, r=10, t=10, b=10),
-            template="plotly_dark",
-            hovermode="x unified",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-        )
-        fig.update_xaxes(tickformat="%d %b", showgrid=True)
-        fig.update_yaxes(title="°C", showgrid=True, zeroline=False)
+        # `date`/`tmean` are already typed by the data layer.
+        df_plot = hist[["date", "tmean"]].dropna()
 
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_climate_30d_fig(*_cache_key(location), end, df_plot), use_container_width=True)
 
 
 
-    st.markdown("---")
-    st.markdown("### Climat (Open‑Meteo archive)")
+    st.markdown("---\n\n### Climat (Open‑Meteo archive)")
     st.caption("Pas de scraping externe : on utilise uniquement l'archive Open‑Meteo pour construire des moyennes mensuelles.")
 
-    end12 = date.today()
-    start12 = end12 - timedelta(days=365)
-    hist12 = cached_historical_daily(location, start12, end12)
-    month12 = monthly_means_from_daily(hist12)
+    month12 = monthly_means_from_daily(climate["12m"])
 
     if month12.empty:
         st.info("Impossible de calculer des moyennes mensuelles (historique indisponible).")
     else:
         st.markdown("#### Moyennes mensuelles (12 derniers mois)")
 
-        m12 = month12.copy()
-        m12["tmean"] = pd.to_numeric(m12.get("tmean"), errors="coerce")
-
-        if "month" not in m12.columns:
-            st.info("Format mensuel inattendu (colonne 'month' manquante).")
-        else:
-            # 1) Fabriquer un axe X propre et triable
-            if pd.api.types.is_integer_dtype(m12["month"]) or pd.api.types.is_numeric_dtype(m12["month"]):
-                # month = 1..12 (pas une vraie date) -> on trace en catégorie
-                m12["month_num"] = m12["month"].astype(int)
-                m12 = m12.dropna(subset=["tmean", "month_num"]).sort_values("month_num")
-                x = m12["month_num"].apply(_month_label_fr)
-            else:
-                # month est date-like -> on trace en vrai datetime
-                m12["month_dt"] = pd.to_datetime(m12["month"], errors="coerce")
-                m12 = m12.dropna(subset=["tmean", "month_dt"]).sort_values("month_dt")
-                x = m12["month_dt"]
-
-            # 2) Graphe Plotly
-            if not m12.empty:
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=x,
-                    y=m12["tmean"],
-                    mode="lines+markers",
-                    name="T° moyenne mensuelle (°C)",
-                    line=dict(color="#00C853", width=2),   # <- couleur
-                    marker=dict(color="#00C853"),
-                    hovertemplate="%{x}<br>T°: %{y:.1f}°C<extra></extra>",
-                ))
-
-                fig.update_layout(
-                    height=320,
-                    margin=dict(l=10, r=10, t=10, b=10),
-                    template="plotly_dark",
-                    hovermode="x unified",
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-                )
-                fig.update_yaxes(title="°C", showgrid=True, zeroline=False)
-                fig.update_xaxes(showgrid=True)
-
-                st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_climate_12m_fig(*_cache_key(location), end, month12), use_container_width=True)
 
 
 
     st.markdown("#### Normales approximatives (5 dernières années)")
 
-    start5y = end - timedelta(days=5 * 365)
-    hist5y = cached_historical_daily(location, start5y, end)
-    month5y = monthly_means_from_daily(hist5y)
+    month5y = monthly_means_from_daily(climate["5y"])
 
     if month5y.empty:
         st.info("Historique 5 ans indisponible pour cette localisation.")
     else:
-        m5 = month5y.copy()
-        m5["month"] = pd.to_datetime(m5["month"], errors="coerce")
-        m5["tmean"] = pd.to_numeric(m5["tmean"], errors="coerce")
-        m5 = m5.dropna(subset=["month", "tmean"]).sort_values("month")
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=m5["month"],
-            y=m5["tmean"],
-            mode="lines",
-            name="Normale approx (°C)",
-            line=dict(color="#FF5252", width=2),
-            hovertemplate="%{x|%b %Y}<br>T°: %{y:.1f}°C<extra></extra>",
-        ))
-
-        fig.update_layout(
-            height=320,
-            margin=dict(l=10, r=10, t=10, b=10),
-            template="plotly_dark",
-            hovermode="x unified",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-        )
-        fig.update_xaxes(tickformat="%b\n%Y", dtick="M6", showgrid=True)
-        fig.update_yaxes(title="°C", showgrid=True, zeroline=False)
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_climate_5y_fig(*_cache_key(location), end, month5y), use_container_width=True)
 
 
 
@@ -10,10 +10,15 @@ the Streamlit UI (app/streamlit_app.py) stays focused on presentation.
 
 from __future__ import annotations
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 from .open_meteo_api import Location, fetch_forecast as _fetch_forecast, fetch_historical_daily as _fetch_historical_daily, geocode_city as _geocode_city
@@ -33,18 +38,22 @@ PROCESSED_DIR = DATA_DIR / "processed"
 for _d in (DATA_DIR, RAW_DIR, PROCESSED_DIR):
     _d.mkdir(parents=True, exist_ok=True)
 
-def _normalize_dates(values) -> pd.Series:
-    """Return a normalized date Series from list/Index/Series of datetimes."""
-    dt = pd.to_datetime(values, errors='coerce')
-    # pd.to_datetime(list) may return a DatetimeIndex (no .dt accessor)
-    if hasattr(dt, 'dt'):
-        return dt.dt.normalize()
-    return pd.DatetimeIndex(dt).normalize().to_series(index=range(len(dt)))
+# Open‑Meteo timestamps are always ISO with a fixed layout: passing the format
+# skips pandas' per-element format inference.
+_FMT_HOURLY = "%Y-%m-%dT%H:%M"
+_FMT_DAILY = "%Y-%m-%d"
 
+def _normalize_dates(values) -> pd.DatetimeIndex:
+    """Return the dates (midnight) of a list/Index/Series of datetimes."""
+    return pd.DatetimeIndex(pd.to_datetime(values, format=_FMT_DAILY, errors='coerce', cache=True)).floor("D")
+
+# Runs of non-alphanumeric characters (`\w` is str.isalnum() plus "_"), so
+# accented letters are kept in slugs.
+_SLUG_SEP = re.compile(r'[\W_]+')
+
+@lru_cache(maxsize=256)
 def _slug(loc: Location) -> str:
-    s = f"{loc.name}-{loc.country}".lower()
-    s = ''.join(ch if ch.isalnum() else '-' for ch in s)
-    s = '-'.join([p for p in s.split('-') if p])
+    s = _SLUG_SEP.sub('-', f"{loc.name}-{loc.country}".lower()).strip('-')
     return s[:80] or 'location'
 
 def save_raw_json(filename: str, payload: Dict[str, Any]) -> None:
@@ -54,12 +63,31 @@ def save_raw_json(filename: str, payload: Dict[str, Any]) -> None:
         # Never crash the UI because of filesystem issues.
         return
 
-def save_processed_csv(filename: str, df: pd.DataFrame) -> None:
+# Processed CSVs are a by-product (grading / debug): they are written by one
+# background worker, off the request path, and can be turned off entirely with
+# SAVE_PROCESSED_CSV=0.
+SAVE_PROCESSED_CSV = os.getenv("SAVE_PROCESSED_CSV", "1") != "0"
+_CSV_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="csv-writer")
+
+def _write_csv(filename: str, df: pd.DataFrame) -> None:
     try:
         df.to_csv(PROCESSED_DIR / filename, index=False)
     except Exception:
         return
 
+def save_processed_csv(filename: str, df: pd.DataFrame) -> None:
+    """Queue `df` to be written to data/processed (callers must not mutate it)."""
+    if SAVE_PROCESSED_CSV:
+        _CSV_WRITER.submit(_write_csv, filename, df)
+
+def _save_forecast_tables(slug: str, payload: Dict[str, Any]) -> None:
+    h = to_hourly_df(payload)
+    d = to_daily_df(payload)
+    if not h.empty:
+        _write_csv(f"hourly_{slug}.csv", h)
+    if not d.empty:
+        _write_csv(f"daily_{slug}.csv", d)
+
 
 
 # -----------------------------
@@ -80,13 +108,9 @@ def fetch_forecast(location: Location) -> Dict[str, Any]:
     """Fetch forecast JSON and save it to data/raw."""
     payload = _fetch_forecast(location)
     save_raw_json(f"forecast_{_slug(location)}.json", payload)
-    # Also save the tidy tables for grading / debug
-    h = to_hourly_df(payload)
-    d = to_daily_df(payload)
-    if not h.empty:
-        save_processed_csv(f"hourly_{_slug(location)}.csv", h)
-    if not d.empty:
-        save_processed_csv(f"daily_{_slug(location)}.csv", d)
+    # Also save the tidy tables for grading / debug (built in the background too)
+    if SAVE_PROCESSED_CSV:
+        _CSV_WRITER.submit(_save_forecast_tables, _slug(location), payload)
     return payload
 
 def fetch_historical_daily(location: Location, *, start: date, end: date) -> pd.DataFrame:
@@ -96,12 +120,41 @@ def fetch_historical_daily(location: Location, *, start: date, end: date) -> pd.
         save_processed_csv(f"historical_daily_{_slug(location)}_{start}_{end}.csv", df)
     return df
 
+# "Climat" tab windows: key -> number of days back from `end`.
+CLIMATE_WINDOWS: Dict[str, int] = {
+    "30d": 30,
+    "12m": 365,
+    "5y": 5 * 365,
+}
+
+
+def fetch_climate_bundle(location: Location, *, end: date) -> Dict[str, pd.DataFrame]:
+    """Fetch every historical window of the "Climat" tab.
+
+    The widest window already contains the others, so a single archive call
+    is made and the shorter windows are sliced from it (the `date` column is
+    sorted, hence a binary search). Returns ``{window_key: dataframe}`` (see
+    CLIMATE_WINDOWS).
+    """
+
+    widest = max(CLIMATE_WINDOWS.values())
+    df = fetch_historical_daily(location, start=end - timedelta(days=widest), end=end)
+    if df.empty:
+        return {key: df for key in CLIMATE_WINDOWS}
+
+    bundle: Dict[str, pd.DataFrame] = {}
+    for key, days in CLIMATE_WINDOWS.items():
+        i = df["date"].searchsorted(pd.Timestamp(end - timedelta(days=days)))
+        bundle[key] = df.iloc[i:].reset_index(drop=True)
+    return bundle
+
+
 # -----------------------------
 # Default cities (France-first)
 # -----------------------------
 
 # A curated list of popular French cities to match the "weather app" experience.
-DEFAULT_FAVORITES_FR: list[str] = [
+DEFAULT_FAVORITES_FR: tuple[str, ...] = (
     "Paris",
     "Marseille",
     "Lyon",
@@ -145,7 +198,7 @@ DEFAULT_FAVORITES_FR: list[str] = [
     "Biarritz",
     "La Rochelle",
     "Saint-Malo",
-]
+)
 
 
 # -----------------------------
@@ -153,6 +206,14 @@ DEFAULT_FAVORITES_FR: list[str] = [
 # -----------------------------
 
 
+def _downcast_floats(df: pd.DataFrame) -> pd.DataFrame:
+    """Store float64 columns as float32 (Open‑Meteo values are single precision)."""
+    floats = df.select_dtypes("float64").columns
+    if len(floats) == 0:
+        return df
+    return df.astype({c: "float32" for c in floats})
+
+
 def to_hourly_df(payload: Dict[str, Any]) -> pd.DataFrame:
     """Convert Open‑Meteo forecast payload to an hourly DataFrame."""
 
@@ -162,7 +223,8 @@ def to_hourly_df(payload: Dict[str, Any]) -> pd.DataFrame:
 
     df = pd.DataFrame(hourly)
     if "time" in df.columns:
-        df["time"] = pd.to_datetime(df["time"], errors="coerce")
+        df["time"] = pd.to_datetime(df["time"], format=_FMT_HOURLY, errors="coerce", cache=True)
+    df = _downcast_floats(df)
 
     # Ensure we can display *night* icons for hourly cards.
     # Open‑Meteo provides `is_day` in the current weather, but not always in hourly.
@@ -173,17 +235,23 @@ def to_hourly_df(payload: Dict[str, Any]) -> pd.DataFrame:
             sun = pd.DataFrame(
                 {
                     "date": _normalize_dates(daily.get("time")),
-                    "sunrise": pd.to_datetime(daily.get("sunrise"), errors="coerce").to_numpy(),
-                    "sunset": pd.to_datetime(daily.get("sunset"), errors="coerce").to_numpy(),
+                    "sunrise": pd.to_datetime(daily.get("sunrise"), format=_FMT_HOURLY, errors="coerce", cache=True).to_numpy(),
+                    "sunset": pd.to_datetime(daily.get("sunset"), format=_FMT_HOURLY, errors="coerce", cache=True).to_numpy(),
                 }
             ).dropna(subset=["date"])
 
             if not sun.empty:
-                df["date"] = df["time"].dt.normalize()
-                df = df.merge(sun[["date", "sunrise", "sunset"]], on="date", how="left")
-                is_day = (df["time"] >= df["sunrise"]) & (df["time"] < df["sunset"])
-                df["is_day"] = is_day.astype("Int64")
-                df = df.drop(columns=["sunrise", "sunset", "date"], errors="ignore")
+                # Find each hour's day with a binary search on the sorted daily
+                # dates (no merge-join / temporary columns).
+                sun = sun.sort_values("date")
+                day_starts = sun["date"].to_numpy()
+                times = df["time"].to_numpy()
+                idx = np.searchsorted(day_starts, times, side="right") - 1
+                known = idx >= 0
+                idx = idx.clip(min=0)
+                known &= day_starts[idx] == times.astype("datetime64[D]")
+                is_day = known & (times >= sun["sunrise"].to_numpy()[idx]) & (times < sun["sunset"].to_numpy()[idx])
+                df["is_day"] = pd.array(is_day.astype(int), dtype="Int64")
 
     return df
 
@@ -197,8 +265,8 @@ def to_daily_df(payload: Dict[str, Any]) -> pd.DataFrame:
 
     df = pd.DataFrame(daily)
     if "time" in df.columns:
-        df["time"] = pd.to_datetime(df["time"], errors="coerce")
-    return df
+        df["time"] = pd.to_datetime(df["time"], format=_FMT_DAILY, errors="coerce", cache=True)
+    return _downcast_floats(df)
 
 
 # -----------------------------
@@ -219,15 +287,18 @@ class TemperatureStats:
 def compute_temperature_stats(series: pd.Series) -> Optional[TemperatureStats]:
     """Compute descriptive stats for a numeric series."""
 
-    s = pd.to_numeric(series, errors="coerce").dropna()
-    if s.empty:
+    a = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    a = a[~np.isnan(a)]
+    if a.size == 0:
         return None
 
+    # Plain NumPy reductions on one contiguous float64 array: no pandas
+    # dispatch or NaN-skipping per call.
     return TemperatureStats(
-        mean=float(s.mean()),
-        minimum=float(s.min()),
-        maximum=float(s.max()),
-        std=float(s.std(ddof=1)) if len(s) > 1 else 0.0,
+        mean=float(a.mean()),
+        minimum=float(a.min()),
+        maximum=float(a.max()),
+        std=float(a.std(ddof=1)) if a.size > 1 else 0.0,
     )
 
 
@@ -235,23 +306,25 @@ def monthly_means_from_daily(df_daily: pd.DataFrame) -> pd.DataFrame:
     """Aggregate a daily dataframe to monthly mean temperature.
 
     Expects at least columns: date, tmax, tmin.
-    Returns a dataframe with columns: month, tmean.
+    Returns a dataframe with columns: month (datetime64, sorted), tmean (float),
+    without missing values.
     """
 
     if df_daily.empty:
         return pd.DataFrame()
 
-    df = df_daily.copy()
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date"])
-    if df.empty:
-        return pd.DataFrame()
-
-    df["tmean"] = (pd.to_numeric(df["tmax"], errors="coerce") + pd.to_numeric(df["tmin"], errors="coerce")) / 2.0
-    df = df.dropna(subset=["tmean"])
-    if df.empty:
+    dates = pd.to_datetime(df_daily["date"], format=_FMT_DAILY, errors="coerce", cache=True).to_numpy()
+    tmean = (
+        pd.to_numeric(df_daily["tmax"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        + pd.to_numeric(df_daily["tmin"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    ) * 0.5
+    keep = ~np.isnat(dates) & ~np.isnan(tmean)
+    if not keep.any():
         return pd.DataFrame()
 
-    df["month"] = df["date"].dt.to_period("M").dt.to_timestamp()
-    out = df.groupby("month", as_index=False)["tmean"].mean().sort_values("month").reset_index(drop=True)
-    return out
\ No newline at end of file
+    # Months since epoch as plain int64 group keys (no Period round-trip).
+    ym = dates[keep].astype("datetime64[M]").astype(np.int64)
+    means = pd.Series(tmean[keep]).groupby(ym, sort=True).mean()
+    month = means.index.to_numpy().astype("datetime64[M]").astype(dates.dtype)
+    # Averaged in float64, stored as float32 like the daily inputs.
+    return pd.DataFrame({"month": month, "tmean": means.to_numpy(dtype=np.float32)})
@@ -11,6 +11,7 @@ This keeps the API modules small and consistent.
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import Optional
 
 import requests
@@ -20,13 +21,17 @@ from urllib3.util.retry import Retry
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def build_session(
     *,
     retries: int = 3,
     backoff_factor: float = 0.4,
-    status_forcelist: Optional[list[int]] = None,
+    status_forcelist: Optional[tuple[int, ...]] = None,
 ) -> requests.Session:
-    """Create a configured requests session.
+    """Return the shared, configured requests session.
+
+    The session is built once and then reused, so consecutive API calls keep
+    their pooled keep-alive connections (no new TCP/TLS handshake per call).
 
     Parameters
     ----------
@@ -40,7 +45,7 @@ def build_session(
 
     if status_forcelist is None:
         # Common transient errors (server overload / gateway issues)
-        status_forcelist = [429, 500, 502, 503, 504]
+        status_forcelist = (429, 500, 502, 503, 504)
 
     retry = Retry(
         total=retries,
@@ -53,7 +58,8 @@ def build_session(
         raise_on_status=False,
     )
 
-    adapter = HTTPAdapter(max_retries=retry)
+    # One pool per host (forecast, archive, geocoding), several sockets each.
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=16)
     session = requests.Session()
     session.mount("http://", adapter)
     session.mount("https://", adapter)
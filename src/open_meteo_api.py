@@ -14,10 +14,14 @@ Docs:
 from __future__ import annotations
 
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date
 from typing import Any, Dict, Optional
 
+import numpy as np
+import orjson
 import pandas as pd
 
 from .http_client import build_session
@@ -29,6 +33,18 @@ FORECAST_BASE_URL = "https://api.open-meteo.com/v1/forecast"
 GEOCODING_BASE_URL = "https://geocoding-api.open-meteo.com/v1/search"
 ARCHIVE_BASE_URL = "https://archive-api.open-meteo.com/v1/archive"
 
+# Archive dates, both in the request (start/end) and in the response (time).
+_DATE_FMT = "%Y-%m-%d"
+
+# Last forecast payload per request, with the validators (ETag / Last-Modified)
+# the server sent for it: the next call is a conditional GET, and a 304 reuses
+# the payload without downloading it again. Least recently used entries are
+# evicted first. Shared by every Streamlit session thread: always accessed
+# under _ETAG_LOCK.
+_ETAG_CACHE: OrderedDict[tuple[Any, ...], tuple[Dict[str, str], Dict[str, Any]]] = OrderedDict()
+_ETAG_CACHE_SIZE = 64
+_ETAG_LOCK = threading.Lock()
+
 
 @dataclass(frozen=True)
 class Location:
@@ -77,23 +93,23 @@ def geocode_city(
     try:
         resp = session.get(GEOCODING_BASE_URL, params=params, timeout=timeout_s)
         resp.raise_for_status()
-        payload = resp.json()
+        payload = orjson.loads(resp.content)
     except Exception as exc:  # noqa: BLE001 - project-level: log and return empty
         logger.exception("Geocoding failed (%s)", exc)
         return []
 
-    results = payload.get("results") or []
     locations: list[Location] = []
-    for r in results:
+    append = locations.append
+    for r in payload.get("results") or ():
         try:
-            locations.append(
+            append(
                 Location(
                     name=str(r.get("name", "")),
-                    country=str(r.get("country", r.get("country_code", ""))),
+                    country=str(r["country"] if "country" in r else r.get("country_code", "")),
                     latitude=float(r["latitude"]),
                     longitude=float(r["longitude"]),
                     timezone=str(r.get("timezone", "auto")),
-                    elevation=float(r["elevation"]) if r.get("elevation") is not None else None,
+                    elevation=float(elev) if (elev := r.get("elevation")) is not None else None,
                 )
             )
         except Exception:
@@ -168,14 +184,38 @@ def fetch_forecast(
         ),
     }
 
+    key = (location.latitude, location.longitude, params["timezone"], params["forecast_days"], params["past_days"])
+    with _ETAG_LOCK:
+        conditional, cached = _ETAG_CACHE.get(key, ({}, None))
+
     try:
-        resp = session.get(FORECAST_BASE_URL, params=params, timeout=timeout_s)
+        resp = session.get(FORECAST_BASE_URL, params=params, headers=conditional, timeout=timeout_s)
+        if resp.status_code == 304 and cached is not None:
+            with _ETAG_LOCK:
+                if key in _ETAG_CACHE:
+                    _ETAG_CACHE.move_to_end(key)
+            return cached
         resp.raise_for_status()
-        return resp.json()
+        payload = orjson.loads(resp.content)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Forecast API failed (%s)", exc)
         return {}
 
+    validators: Dict[str, str] = {}
+    if etag := resp.headers.get("ETag"):
+        validators["If-None-Match"] = etag
+    if last_modified := resp.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = last_modified
+    with _ETAG_LOCK:
+        if validators:
+            _ETAG_CACHE[key] = (validators, payload)
+            _ETAG_CACHE.move_to_end(key)
+            if len(_ETAG_CACHE) > _ETAG_CACHE_SIZE:
+                _ETAG_CACHE.popitem(last=False)
+        else:
+            _ETAG_CACHE.pop(key, None)
+    return payload
+
 
 def fetch_historical_daily(
     location: Location,
@@ -187,8 +227,9 @@ def fetch_historical_daily(
     """Fetch historical *daily* data for a location.
 
     Returns a tidy dataframe with columns:
-    - date
-    - tmax, tmin, precip_sum
+    - date (datetime64)
+    - tmax, tmin, precip_sum, weather_code (float, NaN when missing)
+    - tmean: daily mean temperature, (tmax + tmin) / 2 (float64)
     """
 
     session = build_session()
@@ -196,8 +237,8 @@ def fetch_historical_daily(
         "latitude": location.latitude,
         "longitude": location.longitude,
         "timezone": location.timezone or "auto",
-        "start_date": start.isoformat(),
-        "end_date": end.isoformat(),
+        "start_date": start.strftime(_DATE_FMT),
+        "end_date": end.strftime(_DATE_FMT),
         "daily": ",".join(
             [
                 "temperature_2m_max",
@@ -214,7 +255,7 @@ def fetch_historical_daily(
     try:
         resp = session.get(ARCHIVE_BASE_URL, params=params, timeout=timeout_s)
         resp.raise_for_status()
-        payload = resp.json()
+        payload = orjson.loads(resp.content)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Historical API failed (%s)", exc)
         return pd.DataFrame()
@@ -223,13 +264,21 @@ def fetch_historical_daily(
     if not daily:
         return pd.DataFrame()
 
+    # Types are fixed here (datetime dates, float measures, None -> NaN) so
+    # that callers never need to re-parse or coerce the columns. Open‑Meteo
+    # values are single precision: float32 halves the memory traffic.
+    # tmean is reduced and displayed (30-day stats), so it is computed from
+    # the float64 inputs and kept in float64: rounding ties stay unchanged.
+    tmax = np.asarray(daily.get("temperature_2m_max"), dtype=np.float64)
+    tmin = np.asarray(daily.get("temperature_2m_min"), dtype=np.float64)
     df = pd.DataFrame(
         {
-            "date": pd.to_datetime(daily.get("time")),
-            "tmax": daily.get("temperature_2m_max"),
-            "tmin": daily.get("temperature_2m_min"),
-            "precip_sum": daily.get("precipitation_sum"),
-            "weather_code": daily.get("weather_code"),
+            "date": pd.to_datetime(daily.get("time"), format=_DATE_FMT, errors="coerce", cache=True),
+            "tmax": tmax.astype(np.float32),
+            "tmin": tmin.astype(np.float32),
+            "precip_sum": np.asarray(daily.get("precipitation_sum"), dtype=np.float32),
+            "weather_code": np.asarray(daily.get("weather_code"), dtype=np.float32),
+            "tmean": (tmax + tmin) / 2.0,
         }
     )
     return df
@@ -13,7 +13,10 @@ This is useful in a student project to demonstrate:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from operator import ge, le
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -23,48 +26,56 @@ class Vigilance:
     reason: str
 
 
+# ---- Rules of thumb (can be tweaked) ----
+# (field, comparison, threshold, level, reason) checked in priority order:
+# the first matching rule sets the level.
+RULES: tuple[tuple[str, Callable[[float, float], bool], float, str, str], ...] = (
+    ("gusts", ge, 90, "rouge", "Rafales très fortes ({v:.0f} km/h)"),
+    ("tmax", ge, 40, "rouge", "Chaleur extrême (max {v:.0f}°C)"),
+    ("gusts", ge, 70, "orange", "Rafales fortes ({v:.0f} km/h)"),
+    ("pprob", ge, 85, "orange", "Risque de pluie très élevé ({v:.0f}%)"),
+    ("tmin", le, -7, "orange", "Froid marqué (min {v:.0f}°C)"),
+    ("gusts", ge, 55, "jaune", "Rafales modérées ({v:.0f} km/h)"),
+    ("pprob", ge, 60, "jaune", "Risque de pluie ({v:.0f}%)"),
+    ("tmax", ge, 32, "jaune", "Chaud (max {v:.0f}°C)"),
+)
+
+
 def compute_vigilance(forecast: Dict[str, Any]) -> Vigilance:
     """Compute a basic vigilance level from Open‑Meteo forecast payload."""
 
     daily = forecast.get("daily") or {}
 
-    gusts = _safe_max(daily.get("wind_gusts_10m_max"))
-    pprob = _safe_max(daily.get("precipitation_probability_max"))
-    tmax = _safe_max(daily.get("temperature_2m_max"))
-    tmin = _safe_min(daily.get("temperature_2m_min"))
-
-    # ---- Rules of thumb (can be tweaked) ----
-    if gusts is not None and gusts >= 90:
-        return Vigilance("rouge", "Vigilance rouge", f"Rafales très fortes ({gusts:.0f} km/h)")
-    if tmax is not None and tmax >= 40:
-        return Vigilance("rouge", "Vigilance rouge", f"Chaleur extrême (max {tmax:.0f}°C)")
-
-    if gusts is not None and gusts >= 70:
-        return Vigilance("orange", "Vigilance orange", f"Rafales fortes ({gusts:.0f} km/h)")
-    if pprob is not None and pprob >= 85:
-        return Vigilance("orange", "Vigilance orange", f"Risque de pluie très élevé ({pprob:.0f}%)")
-    if tmin is not None and tmin <= -7:
-        return Vigilance("orange", "Vigilance orange", f"Froid marqué (min {tmin:.0f}°C)")
-
-    if gusts is not None and gusts >= 55:
-        return Vigilance("jaune", "Vigilance jaune", f"Rafales modérées ({gusts:.0f} km/h)")
-    if pprob is not None and pprob >= 60:
-        return Vigilance("jaune", "Vigilance jaune", f"Risque de pluie ({pprob:.0f}%)")
-    if tmax is not None and tmax >= 32:
-        return Vigilance("jaune", "Vigilance jaune", f"Chaud (max {tmax:.0f}°C)")
+    values = {
+        "gusts": _safe_max(daily.get("wind_gusts_10m_max")),
+        "pprob": _safe_max(daily.get("precipitation_probability_max")),
+        "tmax": _safe_max(daily.get("temperature_2m_max")),
+        "tmin": _safe_min(daily.get("temperature_2m_min")),
+    }
+
+    for field, op, threshold, level, reason in RULES:
+        v = values[field]
+        if v is not None and op(v, threshold):
+            return Vigilance(level, f"Vigilance {level}", reason.format(v=v))
 
     return Vigilance("verte", "Vigilance verte", "Pas de phénomène dangereux détecté")
 
 
 def _safe_max(values: Optional[list[Any]]) -> Optional[float]:
-    if not values:
-        return None
-    clean = [v for v in values if v is not None]
-    return float(max(clean)) if clean else None
+    return _safe_reduce(values, np.nanmax)
 
 
 def _safe_min(values: Optional[list[Any]]) -> Optional[float]:
-    if not values:
+    return _safe_reduce(values, np.nanmin)
+
+
+def _safe_reduce(values: Optional[list[Any]], reducer: Any) -> Optional[float]:
+    # NumPy turns None into NaN and skips it in a single C loop.
+    if values is None:
+        return None
+    arr = np.asarray(values, dtype=np.float64)
+    # Checked up front instead of silencing the all-NaN RuntimeWarning:
+    # warnings.catch_warnings() is process-global, not thread-safe.
+    if arr.size == 0 or np.isnan(arr).all():
         return None
-    clean = [v for v in values if v is not None]
-    return float(min(clean)) if clean else None
+    return float(reducer(arr))
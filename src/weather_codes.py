@@ -14,54 +14,122 @@ The mapping below is intentionally "small but useful" for a student project.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from functools import lru_cache
+from typing import Any, Final, NamedTuple, Sequence, cast
 
+import numpy as np
 
-@dataclass(frozen=True)
-class WeatherVisual:
-    label_fr: str
-    icon: str
 
+class WeatherVisual(NamedTuple):
+    """Immutable (label, icon) pair, cheap to build and safe to share."""
 
-_DEFAULT = ("Inconnu", "❓", None, None)
+    label_fr: str
+    icon: str
 
 
-# code -> (label_day, icon_day, label_night, icon_night)
+# (code, label_day, icon_day, label_night, icon_night): a tuple literal is a
+# single constant of the module's code object, turned into the code-keyed
+# _CODE_MAP once below.
 #
 # UX goal for this project:
 # - At night, we still want a visible "night" cue (moon) even when the weather
 #   is cloudy/rainy/snowy/etc.
 # - We therefore provide explicit *night variants* for most codes.
-_CODE_MAP: dict[int, tuple[str, str, str | None, str | None]] = {
-    0: ("Ciel dégagé", "☀️", "Nuit claire", "🌙"),
-    1: ("Plutôt dégagé", "🌤️", "Nuit plutôt dégagée", "🌙"),
-    2: ("Partiellement nuageux", "⛅", "Nuit partiellement nuageuse", "🌙☁️"),
-    3: ("Couvert", "☁️", "Couvert (nuit)", "🌙☁️"),
-    45: ("Brouillard", "🌫️", "Brouillard (nuit)", "🌙🌫️"),
-    48: ("Brouillard givrant", "🌫️", "Brouillard givrant (nuit)", "🌙🌫️"),
-    51: ("Bruine faible", "🌦️", "Bruine faible (nuit)", "🌙🌦️"),
-    53: ("Bruine modérée", "🌦️", "Bruine modérée (nuit)", "🌙🌦️"),
-    55: ("Bruine forte", "🌧️", "Bruine forte (nuit)", "🌙🌧️"),
-    56: ("Bruine verglaçante faible", "🌧️", "Bruine verglaçante faible (nuit)", "🌙🌧️"),
-    57: ("Bruine verglaçante forte", "🌧️", "Bruine verglaçante forte (nuit)", "🌙🌧️"),
-    61: ("Pluie faible", "🌧️", "Pluie faible (nuit)", "🌙🌧️"),
-    63: ("Pluie modérée", "🌧️", "Pluie modérée (nuit)", "🌙🌧️"),
-    65: ("Pluie forte", "🌧️", "Pluie forte (nuit)", "🌙🌧️"),
-    66: ("Pluie verglaçante faible", "🌧️", "Pluie verglaçante faible (nuit)", "🌙🌧️"),
-    67: ("Pluie verglaçante forte", "🌧️", "Pluie verglaçante forte (nuit)", "🌙🌧️"),
-    71: ("Neige faible", "🌨️", "Neige faible (nuit)", "🌙🌨️"),
-    73: ("Neige modérée", "🌨️", "Neige modérée (nuit)", "🌙🌨️"),
-    75: ("Neige forte", "❄️", "Neige forte (nuit)", "🌙❄️"),
-    77: ("Grains de neige", "❄️", "Grains de neige (nuit)", "🌙❄️"),
-    80: ("Averses faibles", "🌦️", "Averses faibles (nuit)", "🌙🌦️"),
-    81: ("Averses modérées", "🌧️", "Averses modérées (nuit)", "🌙🌧️"),
-    82: ("Averses fortes", "⛈️", "Averses fortes (nuit)", "🌙⛈️"),
-    85: ("Averses de neige faibles", "🌨️", "Averses de neige faibles (nuit)", "🌙🌨️"),
-    86: ("Averses de neige fortes", "❄️", "Averses de neige fortes (nuit)", "🌙❄️"),
-    95: ("Orage", "⛈️", "Orage (nuit)", "🌙⛈️"),
-    96: ("Orage + grêle", "⛈️", "Orage + grêle (nuit)", "🌙⛈️"),
-    99: ("Orage + forte grêle", "⛈️", "Orage + forte grêle (nuit)", "🌙⛈️"),
-}
+_CODE_DATA: Final[tuple[tuple[int, str, str, str | None, str | None], ...]] = (
+    (0, "Ciel dégagé", "☀️", "Nuit claire", "🌙"),
+    (1, "Plutôt dégagé", "🌤️", "Nuit plutôt dégagée", "🌙"),
+    (2, "Partiellement nuageux", "⛅", "Nuit partiellement nuageuse", "🌙☁️"),
+    (3, "Couvert", "☁️", "Couvert (nuit)", "🌙☁️"),
+    (45, "Brouillard", "🌫️", "Brouillard (nuit)", "🌙🌫️"),
+    (48, "Brouillard givrant", "🌫️", "Brouillard givrant (nuit)", "🌙🌫️"),
+    (51, "Bruine faible", "🌦️", "Bruine faible (nuit)", "🌙🌦️"),
+    (53, "Bruine modérée", "🌦️", "Bruine modérée (nuit)", "🌙🌦️"),
+    (55, "Bruine forte", "🌧️", "Bruine forte (nuit)", "🌙🌧️"),
+    (56, "Bruine verglaçante faible", "🌧️", "Bruine verglaçante faible (nuit)", "🌙🌧️"),
+    (57, "Bruine verglaçante forte", "🌧️", "Bruine verglaçante forte (nuit)", "🌙🌧️"),
+    (61, "Pluie faible", "🌧️", "Pluie faible (nuit)", "🌙🌧️"),
+    (63, "Pluie modérée", "🌧️", "Pluie modérée (nuit)", "🌙🌧️"),
+    (65, "Pluie forte", "🌧️", "Pluie forte (nuit)", "🌙🌧️"),
+    (66, "Pluie verglaçante faible", "🌧️", "Pluie verglaçante faible (nuit)", "🌙🌧️"),
+    (67, "Pluie verglaçante forte", "🌧️", "Pluie verglaçante forte (nuit)", "🌙🌧️"),
+    (71, "Neige faible", "🌨️", "Neige faible (nuit)", "🌙🌨️"),
+    (73, "Neige modérée", "🌨️", "Neige modérée (nuit)", "🌙🌨️"),
+    (75, "Neige forte", "❄️", "Neige forte (nuit)", "🌙❄️"),
+    (77, "Grains de neige", "❄️", "Grains de neige (nuit)", "🌙❄️"),
+    (80, "Averses faibles", "🌦️", "Averses faibles (nuit)", "🌙🌦️"),
+    (81, "Averses modérées", "🌧️", "Averses modérées (nuit)", "🌙🌧️"),
+    (82, "Averses fortes", "⛈️", "Averses fortes (nuit)", "🌙⛈️"),
+    (85, "Averses de neige faibles", "🌨️", "Averses de neige faibles (nuit)", "🌙🌨️"),
+    (86, "Averses de neige fortes", "❄️", "Averses de neige fortes (nuit)", "🌙❄️"),
+    (95, "Orage", "⛈️", "Orage (nuit)", "🌙⛈️"),
+    (96, "Orage + grêle", "⛈️", "Orage + grêle (nuit)", "🌙⛈️"),
+    (99, "Orage + forte grêle", "⛈️", "Orage + forte grêle (nuit)", "🌙⛈️"),
+)
+_CODE_MAP: Final[dict[int, tuple[str, str, str | None, str | None]]] = {row[0]: row[1:] for row in _CODE_DATA}
+
+
+# WMO codes are small integers (< 100): visuals are prebuilt once into two
+# dense tables indexed by code, one for day and one for night (night falls back
+# to the day label/icon when there is no variant). A call is a bounds check and
+# a tuple index returning a shared instance; unused codes hold the "unknown"
+# visual of the table (with a night cue at night, like every other code).
+# (A generated `match code: case 0: ...` was measured slower: CPython compiles
+# it to a chain of comparisons, ~4x slower than the index for the high codes.)
+_N_CODES: Final = 100
+_DEFAULT_DAY: Final = WeatherVisual("Inconnu", "❓")
+_DEFAULT_NIGHT: Final = WeatherVisual("Inconnu (nuit)", "🌙❓")
+_day: list[WeatherVisual] = [_DEFAULT_DAY] * _N_CODES
+_night: list[WeatherVisual] = [_DEFAULT_NIGHT] * _N_CODES
+# Strings are interned so repeated labels/icons are one shared object.
+for _code, (_label_day, _icon_day, _label_night, _icon_night) in _CODE_MAP.items():
+    _label_day, _icon_day = sys.intern(_label_day), sys.intern(_icon_day)
+    _day[_code] = WeatherVisual(_label_day, _icon_day)
+    # Missing night variants fall back to the day ones here, once, not per call.
+    _night[_code] = WeatherVisual(sys.intern(_label_night or _label_day), sys.intern(_icon_night or _icon_day))
+_DAY_TABLE: Final[tuple[WeatherVisual, ...]] = tuple(_day)
+_NIGHT_TABLE: Final[tuple[WeatherVisual, ...]] = tuple(_night)
+del _day, _night, _code, _label_day, _icon_day, _label_night, _icon_night
+
+
+def get_visual(code: int, night: bool) -> WeatherVisual:
+    """Shared visual for an already validated code (int, 0 <= code < 100).
+
+    Same (code, night) -> same object, so callers can compare results with
+    ``is``. Use :func:`code_to_visual` for raw API values.
+    """
+
+    return (_NIGHT_TABLE if night else _DAY_TABLE)[code]
+
+
+def _is_night(is_day: Any) -> bool:
+    if is_day is None:
+        return False
+    if isinstance(is_day, str):
+        return is_day.strip() in ("0", "false", "False")
+    # bool/int (documented) and numpy/float scalars; NaN / pd.NA -> day.
+    return isinstance(is_day, (int, float, np.number, np.bool_)) and is_day == 0
+
+
+def _visual(code: int | None, is_day: int | bool | None) -> WeatherVisual:
+    night: bool = _is_night(is_day)
+    if code is None:
+        return _DEFAULT_NIGHT if night else _DEFAULT_DAY
+    # JSON codes are already plain ints: only cast other types (numpy, float).
+    if type(code) is not int:
+        try:
+            code = int(code)
+        except (ValueError, OverflowError):
+            # NaN / inf
+            return _DEFAULT_NIGHT if night else _DEFAULT_DAY
+    if not 0 <= code < _N_CODES:
+        return _DEFAULT_NIGHT if night else _DEFAULT_DAY
+    return (_NIGHT_TABLE if night else _DAY_TABLE)[code]
+
+
+# Pure function over a handful of distinct (code, is_day) inputs: memoized, a
+# repeated call is one hash lookup on the raw arguments.
+_cached_visual = lru_cache(maxsize=256)(_visual)
 
 
 def code_to_visual(code: int | None, is_day: int | bool | None = None) -> WeatherVisual:
@@ -72,18 +140,102 @@ def code_to_visual(code: int | None, is_day: int | bool | None = None) -> Weathe
         is_day: 1/True for day, 0/False for night. If None, uses day icon.
     """
 
-    if code is None:
-        label_day, icon_day, label_night, icon_night = _DEFAULT
-    else:
-        label_day, icon_day, label_night, icon_night = _CODE_MAP.get(int(code), _DEFAULT)
-
-    night = False
-    if is_day is not None:
-        try:
-            night = int(is_day) == 0
-        except Exception:
-            night = False
+    try:
+        return _cached_visual(code, is_day)
+    except TypeError:
+        pass
+    # Unhashable input, e.g. 0-d arrays from ``df.to_numpy()[i]``: unwrap
+    # them to scalars and apply the same rules without the cache.
+    if isinstance(code, np.ndarray) and code.ndim == 0:
+        code = code.item()
+    if isinstance(is_day, np.ndarray) and is_day.ndim == 0:
+        is_day = is_day.item()
+    return _visual(code, is_day)
+
+
+# Dense (weather_code, is_day) -> icon table for vectorized lookups, e.g.
+# ``ICON_TABLE[codes, is_day]`` on whole numpy columns.
+# The extra last row holds the "unknown" icon, to be used for missing /
+# out-of-range codes.
+UNKNOWN_ROW: Final = _N_CODES
+ICON_TABLE: Final[np.ndarray] = np.empty((UNKNOWN_ROW + 1, 2), dtype=object)
+ICON_TABLE[:_N_CODES, 0] = [v.icon for v in _NIGHT_TABLE]
+ICON_TABLE[:_N_CODES, 1] = [v.icon for v in _DAY_TABLE]
+ICON_TABLE[UNKNOWN_ROW] = (_DEFAULT_NIGHT.icon, _DEFAULT_DAY.icon)
+
+# code -> day icon, for callers that only need the day variant (daily rows):
+# ``df["weather_code"].map(DAY_ICONS)``.
+DAY_ICONS: Final[dict[int, str]] = {code: _DAY_TABLE[code].icon for code in _CODE_MAP}
+
+
+# Batches beyond a few dozen items (hourly grids, climatology backfills) go
+# through one NumPy gather on a dense (code, night) table instead of the Python
+# loop; below this size (measured crossover ~30) building the arrays costs more.
+_VECTORIZE_MIN: Final = 32
+_VISUAL_TABLE: Final[np.ndarray] = np.empty((UNKNOWN_ROW + 1, 2), dtype=object)
+# fill(): slice assignment would unpack the tuples
+_VISUAL_TABLE[:, 0].fill(_DEFAULT_DAY)
+_VISUAL_TABLE[:, 1].fill(_DEFAULT_NIGHT)
+for _code in range(_N_CODES):
+    _VISUAL_TABLE[_code, 0] = _DAY_TABLE[_code]
+    _VISUAL_TABLE[_code, 1] = _NIGHT_TABLE[_code]
+del _code
+
+
+def _codes_to_visuals_np(codes: Any, is_day_flags: Any) -> list[WeatherVisual] | None:
+    """Vectorized codes_to_visuals for numeric inputs (None when not applicable).
+
+    Same rules as code_to_visual: codes truncate toward zero like ``int()``,
+    missing / non-finite / out-of-range codes map to the "unknown" visual.
+    """
 
-    label = label_night if (night and label_night) else label_day
-    icon = icon_night if (night and icon_night) else icon_day
-    return WeatherVisual(label_fr=label, icon=icon)
+    try:
+        c = np.asarray(codes)
+        d = np.asarray(is_day_flags)
+    except (TypeError, ValueError):
+        return None
+    # Only bool / int / float arrays: strings ("3.5", "0.0"), None or pd.NA
+    # would be parsed differently from the scalar rules, so leave them to it.
+    if c.dtype.kind not in "biuf" or d.dtype.kind not in "biuf":
+        return None
+    if c.ndim != 1 or c.shape != d.shape:
+        return None
+    c = c.astype(np.float64, copy=False)
+
+    t = np.trunc(c)
+    valid = np.isfinite(c) & (t >= 0) & (t < _N_CODES)
+    rows = np.where(valid, t, UNKNOWN_ROW).astype(np.intp)
+    return cast(list[WeatherVisual], _VISUAL_TABLE[rows, (d == 0).astype(np.intp)].tolist())
+
+
+def codes_to_visuals(
+    codes: Sequence[int | None], is_day_flags: Sequence[int | bool | None]
+) -> list[WeatherVisual]:
+    """Batch :func:`code_to_visual` over aligned code / is_day sequences."""
+
+    if len(codes) >= _VECTORIZE_MIN:
+        visuals = _codes_to_visuals_np(codes, is_day_flags)
+        if visuals is not None:
+            return visuals
+
+    # Locals instead of globals inside the loop.
+    day_table, night_table, n_codes, is_night = _DAY_TABLE, _NIGHT_TABLE, _N_CODES, _is_night
+    default_day, default_night = _DEFAULT_DAY, _DEFAULT_NIGHT
+    out: list[WeatherVisual] = []
+    append = out.append
+    for code, is_day in zip(codes, is_day_flags):
+        night = is_night(is_day)
+        if code is None:
+            append(default_night if night else default_day)
+            continue
+        if type(code) is not int:
+            try:
+                code = int(code)
+            except (ValueError, OverflowError):
+                append(default_night if night else default_day)
+                continue
+        if not 0 <= code < n_codes:
+            append(default_night if night else default_day)
+            continue
+        append((night_table if night else day_table)[code])
+    return out
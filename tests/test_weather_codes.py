@@ -0,0 +1,19 @@
+"""Batch lookups must not depend on the batch size (NumPy vs scalar path)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.weather_codes import _VECTORIZE_MIN, code_to_visual, codes_to_visuals
+
+N = _VECTORIZE_MIN + 8
+
+
+def test_string_codes_and_flags_match_across_batch_sizes() -> None:
+    # Raw API-ish values, outside the declared int / bool types on purpose.
+    cases: list[tuple[Any, Any]] = [("3.5", 1), ("3", "0"), (3, "0.0"), ("3", "false"), (3.0, 0)]
+    for code, is_day in cases:
+        big = codes_to_visuals([code] * N, [is_day] * N)
+        small = codes_to_visuals([code], [is_day])
+        assert big == small * N, (code, is_day)
+        assert small == [code_to_visual(code, is_day)], (code, is_day)